@@ -1,8 +1,7 @@
 from datetime import datetime, timedelta
-from pypsse import pyPSSE_instance
 from helper_federate import Helper
 from shutil import copyfile
-from cymepy import cymepy
+import standin_federates
 import multiprocessing
 import pandas as pd
 import numpy as np
@@ -31,22 +30,34 @@ def run_broker(n, ip, port):
     return
 
 def run_cyme(settings):
+    # PSS/E and CYME are only imported when used so the stand-in scenarios
+    #   (run_standin_scenario) run without them
+    from cymepy import cymepy
     dist_instance = cymepy.cymeInstance(settings)
     dist_instance.runSimulation()
 
 def run_psse(model_path):
+    from pypsse import pyPSSE_instance
     trans_inst = pyPSSE_instance.pyPSSE_instance(model_path)
     trans_inst.init()
     trans_inst.run()
 
-def run_helper(broker_ip, broker_port, publications, duration_sec, timestep_sec, maxitrs,  method):
-    helper_federate = Helper(broker_ip, broker_port, publications, duration_sec, timestep_sec, maxitrs,  method)
+def run_helper(broker_ip, broker_port, publications, duration_sec, timestep_sec, maxitrs,  method,
+               name="helper_federate", tol=None):
+    helper_federate = Helper(broker_ip, broker_port, publications, duration_sec, timestep_sec, maxitrs,  method,
+                             name, tol)
     helper_federate.run()
 
 class Cosimulation:
 
     maxiters = 5
     algo = 0
+    # Number of helper federates; the coupling buses are split evenly
+    #   between them so their relaxation runs in parallel
+    helper_shards = 1
+    # Relative change below which the helpers stop iterating a time step
+    #   early; None always uses all maxiters co-iterations
+    helper_tol = None
 
     cyme_model_paths = [
         r"C:\Users\alatif\Desktop\Models\Cyme\ieee13node1\Settings.toml",
@@ -148,6 +159,50 @@ class Cosimulation:
         subpath = self.psse_model.replace("pyPSSE_settings.toml", "Subscriptions.csv")
         subs.to_csv(subpath, index=False)
 
+    def helper_publications(self, i):
+        """
+        :param i: Index of the coupling bus (and CYME model)
+        :return: Helper publications for the coupling bus: P and Q of CYME
+            model i for PSS/E and the bus voltage from PSS/E for CYME
+        """
+        bus = self.coupling_buses[i]
+        return [
+            f"CYME{i+1}.Source.SUB650WYE-S2.KWTOT..helper",
+            f"CYME{i+1}.Source.SUB650WYE-S2.KVARTOT..helper",
+            f"psse.Buses.{bus}.PU..helper",
+        ]
+
+    def shard_helper_publications(self, n_shards, n_buses=None):
+        """
+        Splits the helper publications between n_shards helper federates,
+        keeping all signals of a coupling bus in the same shard.
+
+        :param n_buses: Number of coupling buses in use (one per CYME model
+            by default)
+        :return: List of publication lists, one per shard
+        """
+        if n_buses is None:
+            n_buses = len(self.cyme_model_paths)
+        shards = []
+        for buses in np.array_split(np.arange(n_buses), min(n_shards, n_buses)):
+            shards.append([p for i in buses for p in self.helper_publications(i)])
+        missing = set(self.publications) - {p for shard in shards for p in shard}
+        if missing:
+            raise ValueError(f"Helper publications not assigned to a shard: {sorted(missing)}")
+        return shards
+
+    def run_helpers(self, sim_time, timestep, n_buses=None):
+        shards = self.shard_helper_publications(self.helper_shards, n_buses)
+        for k, publications in enumerate(shards):
+            p = multiprocessing.Process(
+                target=run_helper,
+                args=(self.broker, self.port, publications, sim_time, timestep, self.maxiters, self.algo,
+                      f"helper_federate_{k}", self.helper_tol,)
+            )
+            self.jobs.append(p)
+            p.start()
+        return len(shards)
+
     def update_cyme_settings(self, duration_sec, timestep_sec, itrmode, cosim_mode, helper_federate):
         all_settings = []
         cyme_subscriptions = []
@@ -205,21 +260,16 @@ class Cosimulation:
         #RUN BROKER
         if cosim_mode:
             if helper_federate:
-                n = len(cyme_settings) + 2
+                n = len(cyme_settings) + 1 + min(self.helper_shards, len(cyme_settings))
             else:
                 n = len(cyme_settings) + 1
             p = multiprocessing.Process(target=run_broker, args=(n, self.broker, self.port,))
             self.jobs.append(p)
             p.start()
 
-        # RUN HELPER FEDERATE
+        # RUN HELPER FEDERATES
         if helper_federate:
-            p = multiprocessing.Process(
-                target=run_helper,
-                args=(self.broker, self.port, self.publications, sim_time, timestep, self.maxiters, self.algo,)
-            )
-            self.jobs.append(p)
-            p.start()
+            self.run_helpers(sim_time, timestep)
 
         # #RUN CYME INSTANCES
         for i, sc in enumerate(cyme_settings):
@@ -233,6 +283,58 @@ class Cosimulation:
         return
 
 
+    def run_standin_scenario(self, sim_time, timestep, stiffness, helper_federate=True, n_feeders=None,
+                             mutual=0.1):
+        """
+        Runs the co-simulation with the stand-in transmission and feeder
+        federates from standin_federates instead of PSS/E and CYME, one
+        feeder per coupling bus. Needs no model files or licenses.
+
+        :param stiffness: Coupling stiffness of the stand-in transmission
+            system (see standin_federates)
+        :param n_feeders: Number of coupling buses to use (one per CYME
+            model by default)
+        :return: Co-iteration statistics from the transmission stand-in
+        """
+        self.jobs = []
+        if n_feeders is None:
+            n_feeders = len(self.cyme_model_paths)
+        buses = self.coupling_buses[:n_feeders]
+        loads = [self.loads[b] for b in buses]
+
+        #RUN BROKER
+        n = 2
+        if helper_federate:
+            self.publications = [p for i in range(n_feeders) for p in self.helper_publications(i)]
+            n += min(self.helper_shards, n_feeders)
+        p = multiprocessing.Process(target=run_broker, args=(n, self.broker, self.port,))
+        self.jobs.append(p)
+        p.start()
+
+        # RUN HELPER FEDERATES
+        if helper_federate:
+            self.run_helpers(sim_time, timestep, n_feeders)
+
+        #RUN FEEDER STAND-IN
+        p = multiprocessing.Process(
+            target=standin_federates.run_distribution,
+            args=(buses, loads, sim_time, timestep, self.maxiters, helper_federate,)
+        )
+        self.jobs.append(p)
+        p.start()
+
+        #RUN TRANSMISSION STAND-IN
+        # In a worker process as well, HELICS does not recover in processes
+        #   forked after it was used, so the next scenario would not connect
+        with multiprocessing.Pool(1) as pool:
+            results = pool.apply(
+                standin_federates.run_transmission,
+                (buses, loads, sim_time, timestep, stiffness, mutual, self.maxiters, helper_federate,)
+            )
+        for p in self.jobs:
+            p.join()
+        return results
+
     def get_results(self, rPath, scenario):
         nPath = os.path.join(rPath, scenario)
         if not os.path.exists(nPath):
@@ -0,0 +1,87 @@
+"""
+Benchmarks the helper federate's algorithms on the stand-in transmission and
+feeder federates (standin_federates.py), so convergence can be tuned without
+PSS/E or CYME:
+
+    python helper_benchmark.py --stiffness 2 5 10 --algorithms 0 1 2
+
+Every stiffness is run once without a helper federate and then with each of
+the helper algorithms. The order in which HELICS delivers the updates of
+three federates within an iteration varies from run to run, so the runs with
+a helper are repeated (--repeats) and averaged. The mean and largest number
+of co-iterations per time step, the share of time steps that converged
+within --maxiters co-iterations, the mean final change and the wall time of
+every case are printed and written to --output.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from Simulation import Cosimulation
+
+# Helper.methods without newton_raphson, which is not implemented yet
+ALGORITHMS = {0: "no_algorithm", 1: "gradient_descent", 2: "heavy_ball"}
+
+
+def run_case(sim, args, stiffness, algo):
+    helper_federate = algo is not None
+    if helper_federate:
+        sim.algo = algo
+    start = time.perf_counter()
+    results = sim.run_standin_scenario(args.duration, args.timestep, stiffness, helper_federate, args.feeders,
+                                       args.mutual)
+    # The first time step starts from the nominal loads rather than the
+    #   last solution, leave it out
+    iterations = np.array(results["iterations"][1:])
+    residuals = np.array(results["residuals"][1:])
+    return {
+        "stiffness": stiffness,
+        "helper": ALGORITHMS[algo] if helper_federate else "no_helper",
+        "mean_coiterations": iterations.mean(),
+        "max_coiterations": iterations.max(),
+        "converged": np.mean(iterations < args.maxiters),
+        "mean_residual": np.nanmean(residuals),
+        "federation_time": results["wall_time"],
+        "wall_time": time.perf_counter() - start,
+    }
+
+
+def main(args):
+    sim = Cosimulation()
+    sim.maxiters = args.maxiters
+    sim.helper_shards = args.shards
+    sim.helper_tol = args.tol
+    rows = []
+    for stiffness in args.stiffness:
+        rows.append(run_case(sim, args, stiffness, None))
+        for algo in args.algorithms:
+            cases = pd.DataFrame([run_case(sim, args, stiffness, algo) for _ in range(args.repeats)])
+            row = cases.mean(numeric_only=True).to_dict()
+            row["max_coiterations"] = cases["max_coiterations"].max()
+            row["helper"] = ALGORITHMS[algo]
+            rows.append(row)
+    df = pd.DataFrame(rows)[list(rows[0])]
+    df.to_csv(args.output, index=False)
+    print(df.to_string(index=False))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the helper federate on the stand-in federates")
+    parser.add_argument("--algorithms", nargs="+", type=int, choices=sorted(ALGORITHMS), default=[0, 1, 2])
+    parser.add_argument("--stiffness", nargs="+", type=float, default=[2.0, 5.0, 10.0])
+    parser.add_argument("--feeders", type=int, default=len(Cosimulation.coupling_buses),
+                        help="Number of coupling buses (one stand-in feeder each)")
+    parser.add_argument("--mutual", type=float, default=0.1, help="Coupling between the buses")
+    parser.add_argument("--maxiters", type=int, default=20, help="Co-iterations allowed per time step")
+    parser.add_argument("--tol", type=float, default=1e-6,
+                        help="Relative change at which the helpers stop iterating a time step")
+    parser.add_argument("--shards", type=int, default=1, help="Number of helper federates")
+    parser.add_argument("--duration", type=float, default=86400.0)
+    parser.add_argument("--timestep", type=float, default=900.0)
+    parser.add_argument("--repeats", type=int, default=3, help="Runs averaged for every helper algorithm")
+    parser.add_argument("--output", default="helper_benchmark_results.csv")
+    main(parser.parse_args())
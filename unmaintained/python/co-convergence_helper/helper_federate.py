@@ -1,7 +1,6 @@
 import scipy.optimize as optimize
 import matplotlib.pyplot as plt
 import multiprocessing
-import pandas as pd
 import helics as h
 import numpy as np
 import math
@@ -9,7 +8,8 @@ import time
 
 class Helper:
 
-    def __init__(self, broker_ip, broker_port, publications, duration_sec, timestep_sec, maxitrs,  method=1):
+    def __init__(self, broker_ip, broker_port, publications, duration_sec, timestep_sec, maxitrs,  method=1,
+                 name="helper_federate", tol=None):
 
         self.methods = {
             0: self.no_algorithm,
@@ -22,57 +22,88 @@ class Helper:
         self.duration_sec = duration_sec
         self.timestep_sec = timestep_sec
         self.maxitrs = maxitrs
+        self.name = name
+        # Stop iterating a time step once the received values change by
+        #   less than tol (see change()); None always uses all maxitrs
+        #   iterations
+        self.tol = tol
 
     def run(self):
-        vfed, pub_list, sub_list = self.helics_federate_boilerplate("helper_federate")
+        vfed, pub_list, sub_list = self.helics_federate_boilerplate(self.name)
+        n = len(pub_list)
+        # History of the received and published values of the current time
+        #   step, one row per iteration; allocated once and reused
+        self.subscriptions = np.zeros((self.maxitrs, n))
+        self.published = np.zeros((self.maxitrs, n))
+        x = None
         for t in np.arange(0,  self.duration_sec, self.timestep_sec):
             # for p in pub_list:
             #     h.helicsPublicationPublishDouble(p, 0.0)
-            self.subscriptions = np.zeros((self.maxitrs, len(pub_list)))
-            currenttime = h.helicsFederateRequestTime(vfed, t)
-            for i in range(self.maxitrs):
-                if i == 0:
-                    while currenttime < t:
-                        currenttime = h.helicsFederateRequestTime(vfed, t)
-                else:
-                    currenttime, iteration_state = h.helicsFederateRequestTimeIterative(
-                        vfed,
-                        t,
-                        h.helics_iteration_request_force_iteration
-                    )
-                k = 0
-                for p, s in zip(pub_list, sub_list):
-                    x0 = h.helicsInputGetDouble(s)
-                    self.subscriptions[i, k] = x0
-                    if t > 1:
-                        b = 0.05
-                        a = t * 0.0025
-                        x0 = self.method(i, k, x0, a, b)
-                    h.helicsPublicationPublishDouble(p, x0)
-                    k += 1
-            self.subscriptions = np.delete(self.subscriptions, 0, 0)
-            self.subscriptions = pd.DataFrame(self.subscriptions)
-            #plt.plot(self.subscriptions)
+            self.subscriptions.fill(0.0)
+            self.published.fill(0.0)
+            # Publishing the values from the last time step lets the
+            #   federation iterate
+            if x is not None:
+                self.publish(pub_list, x)
+            i = 0
+            while True:
+                currenttime, iteration_state = h.helicsFederateRequestTimeIterative(
+                    vfed,
+                    t,
+                    h.helics_iteration_request_iterate_if_needed
+                )
+                if iteration_state == h.helics_iteration_result_next_step and currenttime >= t:
+                    break
+                if i >= self.maxitrs:
+                    # Stop publishing so the federation moves on
+                    continue
+                received = self.read_subscriptions(sub_list, self.subscriptions[i])
+                if self.tol is not None and i > 0 and self.change(received, self.subscriptions[i - 1]) < self.tol:
+                    continue
+                x = received
+                if t > 1:
+                    b = 0.05
+                    a = t * 0.0025
+                    x = self.method(i, x, a, b)
+                self.published[i] = x
+                self.publish(pub_list, x)
+                i += 1
+            #plt.plot(self.subscriptions[1:])
         #plt.show()
 
-    def no_algorithm(self, i, k, x0, a, b):
-        return x0
+    @staticmethod
+    def read_subscriptions(sub_list, out):
+        out[:] = np.fromiter(map(h.helicsInputGetDouble, sub_list), dtype=float, count=len(sub_list))
+        return out.copy()
 
+    @staticmethod
+    def change(x, last):
+        # Largest change relative to the size of the value (absolute below 1)
+        return np.max(np.abs(x - last) / np.maximum(np.abs(last), 1.0))
 
-    def gradient_descent(self, i, k, x0, a, b):
-        dx0 = self.subscriptions[i, k] - self.subscriptions[i - 1, k]
-        x0 = x0 - a * dx0
-        return x0
+    @staticmethod
+    def publish(pub_list, x):
+        for p, x0 in zip(pub_list, x.tolist()):
+            h.helicsPublicationPublishDouble(p, x0)
 
-    def heavy_ball(self, i, k, x0, a, b):
-        dx0 = self.subscriptions[i, k] - self.subscriptions[i - 1, k]
+    # The methods below update all of the coupled signals at once: x holds
+    #   the values received in iteration i, one per signal, and the values
+    #   to publish are returned.
+    def no_algorithm(self, i, x, a, b):
+        return x
+
+
+    def gradient_descent(self, i, x, a, b):
+        dx = self.subscriptions[i] - self.subscriptions[i - 1]
+        return x - a * dx
+
+    def heavy_ball(self, i, x, a, b):
+        dx = self.subscriptions[i] - self.subscriptions[i - 1]
         if i >= 2:
-            x0 = x0 - a * dx0 + b * (x0 - self.subscriptions[i - 2, k])
-        else:
-            x0 = x0 - a * dx0
-        return x0
+            return x - a * dx + b * (x - self.subscriptions[i - 2])
+        return x - a * dx
 
-    def newton_raphson(self, i, k, x0, a, b):
+    def newton_raphson(self, i, x, a, b):
         return
 
     def helics_federate_boilerplate(self, federate_name):
@@ -0,0 +1,174 @@
+"""
+Lightweight stand-ins for the pypsse and cymepy federates started by
+Simulation.py, so the co-iteration between transmission and distribution
+(and the helper federate's algorithms) can be exercised without PSS/E or
+CYME.
+
+The stand-ins use the same publication names as the real federates:
+
+    psse.Buses.<bus>.PU                      transmission bus voltages
+    CYME<i>.Source.SUB650WYE-S2.KWTOT        feeder i active power
+    CYME<i>.Source.SUB650WYE-S2.KVARTOT      feeder i reactive power
+
+and subscribe to the "..helper" versions when a helper federate sits in
+between. The coupling is algebraic:
+
+    feeder i      P = P0 * V**kp * profile(t),  Q = Q0 * V**kq * profile(t)
+    transmission  V = 1 - 0.05 * stiffness * Z @ (S / S0)
+
+where S / S0 is the apparent power of each feeder relative to its nominal
+load and Z couples the buses (1 on the diagonal, `mutual` elsewhere). With
+constant impedance loads (kp = kq = 2) the gain of one transmission ->
+distribution -> transmission round is about 0.1 * stiffness * (row sum of
+Z); plain Jacobi co-iteration stops converging somewhere above
+stiffness = 10 / (row sum of Z).
+"""
+
+import helics as h
+import numpy as np
+import time
+
+
+def feeder_publications(i):
+    return [f"CYME{i+1}.Source.SUB650WYE-S2.KWTOT", f"CYME{i+1}.Source.SUB650WYE-S2.KVARTOT"]
+
+
+def bus_publication(bus):
+    return f"psse.Buses.{bus}.PU"
+
+
+def load_profile(t, period_sec=86400.0):
+    return 1.0 + 0.3 * np.sin(2 * np.pi * t / period_sec)
+
+
+def create_federate(federate_name, timestep_sec):
+    print(f"Creating federate: {federate_name}")
+    fedinfo = h.helicsCreateFederateInfo()
+    h.helicsFederateInfoSetCoreName(fedinfo, federate_name)
+    h.helicsFederateInfoSetCoreTypeFromString(fedinfo, "zmq")
+    h.helicsFederateInfoSetCoreInitString(fedinfo, "--federates=1")
+    h.helicsFederateInfoSetTimeProperty(fedinfo, h.helics_property_time_delta, timestep_sec / 10.0)
+    h.helicsFederateInfoSetIntegerProperty(fedinfo, h.helics_property_int_max_iterations, 1000)
+    return h.helicsCreateValueFederate(federate_name, fedinfo)
+
+
+def publish(pubs, y):
+    for p, y0 in zip(pubs, y.tolist()):
+        h.helicsPublicationPublishDouble(p, y0)
+
+
+def co_iterate(vfed, t, pubs, subs, update, y, max_coiter, tol):
+    """
+    Runs the co-iterations of one time step in the same way as the
+    federates in user_guide_examples/advanced/advanced_iteration: y (the
+    outputs of the last time step) is published so the federation iterates,
+    then every iteration the subscriptions are read and, unless they
+    changed by less than tol (relative to their magnitude, or absolute
+    below 1) or max_coiter updates have been made, new
+    outputs are calculated with update() and published. HELICS moves on to
+    the next time step once no federate publishes anything new.
+
+    :return: Number of updates, largest (relative) change in the
+        subscriptions in the last iteration and the outputs
+    """
+    publish(pubs, y)
+    last = None
+    change = np.inf
+    itr = 0
+    while True:
+        granted, state = h.helicsFederateRequestTimeIterative(vfed, t, h.helics_iteration_request_iterate_if_needed)
+        if state == h.helics_iteration_result_next_step and granted >= t:
+            break
+        x = np.fromiter(map(h.helicsInputGetDouble, subs), dtype=float, count=len(subs))
+        if last is not None:
+            change = float(np.max(np.abs(x - last) / np.maximum(np.abs(last), 1.0)))
+        last = x
+        if change < tol or itr >= max_coiter:
+            # no further iteration necessary (or allowed)
+            continue
+        y = update(x)
+        publish(pubs, y)
+        itr += 1
+    return itr, change, y
+
+
+def run_distribution(buses, loads, duration_sec, timestep_sec, max_coiter=20, helper_federate=True,
+                     kp=2.0, kq=2.0, tol=1e-6):
+    """
+    Stand-in for the CYME models, one feeder per coupling bus. All of the
+    feeders share one federate ("cyme"): with a federate per feeder the
+    order in which HELICS delivers their updates within an iteration
+    varies from run to run, and so do the co-iteration counts.
+
+    :param buses: Coupling bus numbers, one per feeder
+    :param loads: Nominal [P (kW), Q (kvar)] of each feeder
+    """
+    n = len(buses)
+    vfed = create_federate("cyme", timestep_sec)
+    pubs = [h.helicsFederateRegisterGlobalTypePublication(vfed, p, "double", "") for i in range(n)
+            for p in feeder_publications(i)]
+    suffix = "..helper" if helper_federate else ""
+    subs = [h.helicsFederateRegisterSubscription(vfed, bus_publication(b) + suffix, "") for b in buses]
+    for s in subs:
+        h.helicsInputSetDefaultDouble(s, 1.0)
+    h.helicsFederateEnterExecutingMode(vfed)
+
+    P0, Q0 = np.array(loads, dtype=float).T
+    y = np.array(loads, dtype=float).ravel()
+    for t in np.arange(0, duration_sec, timestep_sec):
+        profile = load_profile(t)
+
+        def update(x):
+            V = np.maximum(x, 1e-3)
+            return np.column_stack([P0 * V**kp * profile, Q0 * V**kq * profile]).ravel()
+
+        _, _, y = co_iterate(vfed, t, pubs, subs, update, y, max_coiter, tol)
+    h.helicsFederateDisconnect(vfed)
+    h.helicsFederateFree(vfed)
+
+
+def run_transmission(buses, loads, duration_sec, timestep_sec, stiffness=1.0, mutual=0.1, max_coiter=20,
+                     helper_federate=True, tol=1e-6):
+    """
+    Stand-in for the PSS/E model, with one coupling bus per feeder.
+
+    :param buses: Coupling bus numbers, one per feeder
+    :param loads: Nominal [P (kW), Q (kvar)] of each feeder
+    :return: Dictionary with the number of updates and the final change in
+        the feeder loads of every time step, the final bus voltages and the
+        wall time of the run
+    """
+    n = len(buses)
+    vfed = create_federate("psse", timestep_sec)
+    pubs = [h.helicsFederateRegisterGlobalTypePublication(vfed, bus_publication(b), "double", "") for b in buses]
+    suffix = "..helper" if helper_federate else ""
+    subs = [h.helicsFederateRegisterSubscription(vfed, p + suffix, "") for i in range(n)
+            for p in feeder_publications(i)]
+    S0 = np.array([np.hypot(*loads[i]) for i in range(n)])
+    for s, load in zip(subs, np.ravel([loads[i] for i in range(n)])):
+        h.helicsInputSetDefaultDouble(s, float(load))
+    Z = np.full((n, n), mutual)
+    np.fill_diagonal(Z, 1.0)
+    h.helicsFederateEnterExecutingMode(vfed)
+
+    def update(x):
+        S = np.hypot(x[0::2], x[1::2])
+        return 1.0 - 0.05 * stiffness * Z @ (S / S0)
+
+    y = np.ones(n)
+    iterations = []
+    residuals = []
+    start = time.perf_counter()
+    for t in np.arange(0, duration_sec, timestep_sec):
+        itr, change, y = co_iterate(vfed, t, pubs, subs, update, y, max_coiter, tol)
+        iterations.append(itr)
+        residuals.append(change)
+    wall_time = time.perf_counter() - start
+    h.helicsFederateDisconnect(vfed)
+    h.helicsFederateFree(vfed)
+    return {
+        "iterations": iterations,
+        "residuals": residuals,
+        "voltages": y,
+        "wall_time": wall_time,
+    }
@@ -14,6 +14,7 @@ allison.m.campbell@pnnl.gov
 import matplotlib.pyplot as plt
 import helics as h
 import logging
+import argparse
 import numpy as np
 import sys
 import time
@@ -45,6 +46,13 @@ def destroy_federate(fed):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='EV charge controller')
+    parser.add_argument('-b', '--batch',
+                        help='handle all queued SOC messages as one batch'
+                             ' each time step',
+                        action='store_true')
+    args = parser.parse_args()
+
     ##############  Registering  federate from json  ##########################
     fed = h.helicsCreateMessageFederateFromConfig("ControllerConfig.json")
     federate_name = h.helicsFederateGetName(fed)
@@ -83,42 +91,74 @@ if __name__ == "__main__":
 
     time_sim = []
     soc = {}
+    # Batch mode: SOC of every source (column, by its ID in source_ids)
+    #   at every grant (row), preallocated and doubled when it is full
+    source_ids = {}
+    soc_table = np.full((96, 8), np.nan)
+    # Charging commands, pre-encoded and indexed by the decision
+    replies = (b'0', b'1')
 
     while grantedtime < total_interval:
 
-        # In HELICS, when multiple messages arrive at an endpoint they
-        # queue up and are popped off one-by-one with the
-        #   "helicsEndpointHasMessage" API call. When that API doesn't
-        #   return a message, you've processed them all.
-        while h.helicsEndpointHasMessage(endid):
-
-            # Get the SOC from the EV/charging terminal in question
-            msg = h.helicsEndpointGetMessage(endid)
-            currentsoc = h.helicsMessageGetString(msg)
-            source = h.helicsMessageGetOriginalSource(msg)
-            logger.debug(f'\tReceived message from endpoint {source}'
-                         f' at time {grantedtime}'
-                         f' with SOC {currentsoc}')
-
-            # Send back charging command based on current SOC
-            #   Our very basic protocol:
-            #       If the SOC is less than soc_full keep charging (send "1")
-            #       Otherwise, stop charging (send "0")
-            soc_full = 0.95
-            if float(currentsoc) <= soc_full:
-                instructions = 1
-            else:
-                instructions = 0
-            message = str(instructions)
-            h.helicsEndpointSendBytesTo(endid, message.encode(), source)
-            logger.debug(f'\tSent message to endpoint {source}'
-                         f' at time {grantedtime}'
-                         f' with payload {instructions}')
-
-            # Store SOC for later analysis/graphing
-            if source not in soc:
-                soc[source] = []
-            soc[source].append(float(currentsoc))
+        if args.batch:
+            # Pull every queued SOC message off the endpoint, decide all of
+            #   the charging instructions with one comparison and store the
+            #   SOCs with one assignment into this grant's row of soc_table
+            msgs = []
+            while h.helicsEndpointHasMessage(endid):
+                msgs.append(h.helicsEndpointGetMessage(endid))
+            sources = [h.helicsMessageGetOriginalSource(m) for m in msgs]
+            socs = np.array([h.helicsMessageGetString(m) for m in msgs],
+                            dtype=float)
+            ids = [source_ids.setdefault(s, len(source_ids)) for s in sources]
+            row = len(time_sim)
+            # Double the table when it runs out of rows (grants) or
+            #   columns (sources), so it is only reallocated a few times
+            if row == soc_table.shape[0]:
+                soc_table = np.vstack([soc_table,
+                                       np.full_like(soc_table, np.nan)])
+            if len(source_ids) > soc_table.shape[1]:
+                extra = max(soc_table.shape[1],
+                            len(source_ids) - soc_table.shape[1])
+                soc_table = np.hstack(
+                    [soc_table, np.full((soc_table.shape[0], extra), np.nan)])
+            soc_table[row, ids] = socs
+            for source, charge in zip(sources, (socs <= 0.95).tolist()):
+                h.helicsEndpointSendBytesTo(endid, replies[charge], source)
+        else:
+            # In HELICS, when multiple messages arrive at an endpoint they
+            # queue up and are popped off one-by-one with the
+            #   "helicsEndpointHasMessage" API call. When that API doesn't
+            #   return a message, you've processed them all.
+            while h.helicsEndpointHasMessage(endid):
+
+                # Get the SOC from the EV/charging terminal in question
+                msg = h.helicsEndpointGetMessage(endid)
+                currentsoc = h.helicsMessageGetString(msg)
+                source = h.helicsMessageGetOriginalSource(msg)
+                logger.debug(f'\tReceived message from endpoint {source}'
+                             f' at time {grantedtime}'
+                             f' with SOC {currentsoc}')
+
+                # Send back charging command based on current SOC
+                #   Our very basic protocol:
+                #       If the SOC is less than soc_full keep charging (send "1")
+                #       Otherwise, stop charging (send "0")
+                soc_full = 0.95
+                if float(currentsoc) <= soc_full:
+                    instructions = 1
+                else:
+                    instructions = 0
+                message = str(instructions)
+                h.helicsEndpointSendBytesTo(endid, message.encode(), source)
+                logger.debug(f'\tSent message to endpoint {source}'
+                             f' at time {grantedtime}'
+                             f' with payload {instructions}')
+
+                # Store SOC for later analysis/graphing
+                if source not in soc:
+                    soc[source] = []
+                soc[source].append(float(currentsoc))
 
         time_sim.append(grantedtime)
 
@@ -133,6 +173,12 @@ if __name__ == "__main__":
     # Close out co-simulation execution cleanly now that we're done.
     destroy_federate(fed)
 
+    if args.batch:
+        # Back to one SOC history per source for the graphs
+        for source, k in source_ids.items():
+            column = soc_table[:len(time_sim), k]
+            soc[source] = column[~np.isnan(column)]
+
     # Printing out final results graphs for comparison/diagnostic purposes.
     xaxis = np.array(time_sim)/3600
     y = []
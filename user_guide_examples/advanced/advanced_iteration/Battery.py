@@ -14,6 +14,7 @@ SOC modeled by the charger. Each battery ceases charging when its SOC reaches 10
 trevor.hardy@pnnl.gov
 """
 
+import argparse
 import matplotlib.pyplot as plt
 import helics as h
 import logging
@@ -26,8 +27,6 @@ logger.addHandler(logging.StreamHandler())
 logger.setLevel(logging.DEBUG)
 
 
-feditr = FedItr(logger)
-
 def destroy_federate(fed):
     """
     As part of ending a HELICS co-simulation it is good housekeeping to
@@ -90,7 +89,69 @@ def current_update(charging_voltage, soc):
     else:
         return max(0, charging_voltage / R)
 
+def accelerate_current(accelerator, published, charging_current):
+    """
+    Replaces the recomputed charging currents with the accelerated ones,
+    which are kept non-negative like those from current_update().
+
+    :param accelerator: iterutils.Accelerator
+    :param published: Currents published in the previous iteration
+    :param charging_current: List of recomputed currents, updated in place
+    """
+    currents = accelerator(published, charging_current)
+    charging_current[:] = np.maximum(currents, 0).tolist()
+
+def publish_unaccelerated(fed, pubid, charging_voltage, current_soc, charging_current, epsilon):
+    """
+    With acceleration on, the currents published are extrapolated ones. Once
+    the charging voltages have stopped changing, publishes the currents
+    recomputed from them (the un-accelerated ones) where they differ from
+    those published by more than epsilon, so a time step only ends on
+    currents that answer the voltages.
+
+    :param charging_voltage: iterutils.ItrHistory of the charging voltages
+    :param charging_current: List of published currents, updated in place
+    :return: True if any current was published
+    """
+    unaccelerated = [current_update(v, soc) for v, soc in zip(charging_voltage.latest, current_soc.values())]
+    if np.max(np.abs(np.subtract(unaccelerated, charging_current))) <= epsilon:
+        return False
+    charging_current[:] = unaccelerated
+    feditr.set_pub(fed, pubid, charging_current, final=True)
+    return True
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Iterative EV battery federate")
+    parser.add_argument("-a", "--accelerator", choices=Accelerator.METHODS, default="none",
+                        help="Convergence acceleration applied to the published currents")
+    parser.add_argument("-w", "--window", type=int, default=3,
+                        help="Number of past iterations used by Anderson mixing")
+    parser.add_argument("--telemetry", default=None, metavar="PREFIX",
+                        help="Record every time request of the main loop and write them to"
+                             " <PREFIX>.npz and <PREFIX>_summary.txt at the end of the run"
+                             " (e.g. advanced_iteration_battery_telemetry)")
+    parser.add_argument("--schedule", action="store_true",
+                        help="Adapt the tolerance and iteration budget of each time step to how fast"
+                             " the charging voltages are changing (see iterutils.ItrScheduler)")
+    parser.add_argument("--epsilon_min", type=float, default=1e-5,
+                        help="With --schedule, tolerance (V) of time steps with fast changing voltages")
+    parser.add_argument("--epsilon_max", type=float, default=1e-2,
+                        help="With --schedule, tolerance (V) of time steps with slowly changing voltages")
+    parser.add_argument("--max_itr", type=int, default=20,
+                        help="With --schedule, largest number of iterations in a time step")
+    parser.add_argument("--quasi_static_rate", type=float, default=1e-3,
+                        help="With --schedule, change in charging voltage (V) per time step below"
+                             " which time steps get a single update (0 disables this)")
+    parser.add_argument("--deadband", type=float, default=None,
+                        help="Only publish a charging current if it changed by more than this (A)"
+                             " since it was last published (by default every current is published"
+                             " every iteration)")
+    parser.add_argument("--publish_final", action="store_true",
+                        help="With --deadband, publish the currents held back by the deadband once"
+                             " the charging voltages have converged")
+    args = parser.parse_args()
+    telemetry = ItrTelemetry() if args.telemetry else None
+    feditr = FedItr(logger, telemetry=telemetry)
     np.random.seed(2622)
 
     ##########  Registering  federate and configuring from JSON################
@@ -121,6 +182,14 @@ if __name__ == "__main__":
     ############## Some Setup #################################################
     epsilon = 1e-4
     iterative_mode = True
+    # With --schedule, an iterutils.ItrScheduler picks the tolerance and
+    #   iteration budget of every time step from how fast the charging
+    #   voltages are changing, and settled time steps get a single update
+    scheduler = None
+    if args.schedule:
+        scheduler = ItrScheduler(epsilon, epsilon_min=args.epsilon_min, epsilon_max=args.epsilon_max,
+                                 rate_ref=1.0, max_itr=args.max_itr,
+                                 quasi_static_rate=args.quasi_static_rate)
     batt_list = get_new_battery(pub_count)
 
     # initialize battery soc
@@ -131,7 +200,9 @@ if __name__ == "__main__":
     # initialize state
     vinit = 0
     charging_current = [current_update(vinit, current_soc[j]) for j in range(0, pub_count)] # initial state
-    charging_voltage = {}
+    charging_voltage = ItrHistory(sub_count)
+    accelerator = Accelerator(pub_count, args.accelerator, window=args.window)
+    logger.info(f"Convergence acceleration: {args.accelerator}")
 
     hours = 24 * 5
     total_interval = int(60 * 60 * hours)
@@ -165,6 +236,10 @@ if __name__ == "__main__":
         error = feditr.check_error(charging_voltage)
         logger.debug(f"\tError = {error}")
         if (error < epsilon) and (itr > 0):
+            if args.accelerator != "none" and publish_unaccelerated(
+                    fed, pubid, charging_voltage, current_soc, charging_current, epsilon):
+                itr += 1
+                continue
             # no further iteration necessary
             continue
         else:
@@ -172,10 +247,15 @@ if __name__ == "__main__":
         
         # calculate new currents based on received voltage
         logger.debug("\tCalculation Update:")
+        if itr == 0:
+            accelerator.reset()
+        published = list(charging_current)
         for j in range(0, pub_count):
             # ----- update calculation --------
             # Calculate charging current
-            charging_current[j] = current_update(charging_voltage[j][0], current_soc[j])
+            charging_current[j] = current_update(charging_voltage.latest[j], current_soc[j])
+        accelerate_current(accelerator, published, charging_current)
+        for j in range(0, pub_count):
             logger.debug(f"\t\tBattery {j+1} charging current (A): {charging_current[j]:.2f}")
             try:
                 iinit[j][itr] = charging_current[j]
@@ -195,13 +275,19 @@ if __name__ == "__main__":
     # As long as granted time is in the time range to be simulated...
     while grantedtime < total_interval:
         # Publication needed so we can actually iterate
-        feditr.set_pub(fed, pubid, charging_current)
+        feditr.set_pub(fed, pubid, charging_current, force=True)
         
         # Time request for the next physical interval to be simulated
         requested_time = grantedtime + update_interval
 
+        if scheduler is not None:
+            decision = scheduler.start_step(requested_time)
+            logger.debug(f"\tSchedule: {decision['mode']} - epsilon {decision['epsilon']:.3g}"
+                         f" - max iterations {decision['max_itr']}")
+
         itr = 0
         itr_flag = h.helics_iteration_request_iterate_if_needed
+        accelerator.reset()
         while True:
             grantedtime, itr_state = feditr.request_time(fed, requested_time, itr, itr_flag, iterative_mode=iterative_mode)
             if ((itr_state == h.helics_iteration_result_next_step) and iterative_mode):
@@ -218,21 +304,34 @@ if __name__ == "__main__":
                 # Check convergence
                 error = feditr.check_error(charging_voltage)
                 logger.debug(f"\tError = {error}")
-                if (error < epsilon) and (itr > 0):
+                if scheduler is not None:
+                    converged = scheduler.stop(itr, error)
+                else:
+                    converged = (error < epsilon) and (itr > 0)
+                if (converged and args.accelerator != "none"
+                        and publish_unaccelerated(fed, pubid, charging_voltage, current_soc, charging_current, epsilon)):
+                    itr += 1
+                    continue
+                if converged:
                     # no further iteration necessary
+                    if args.publish_final:
+                        feditr.set_pub(fed, pubid, charging_current, final=True)
                     continue
                 else:
                     # itr_flag = h.helics_iteration_request_force_iteration
                     pass
             
             logger.debug(f"\tCalculation update:")
+            published = list(charging_current)
+            for j in range(0, pub_count):
+                charging_current[j] = current_update(charging_voltage.latest[j], current_soc[j])
+            accelerate_current(accelerator, published, charging_current)
             for j in range(0, pub_count):
-                charging_current[j] = current_update(charging_voltage[j][0], current_soc[j])
                 logger.debug(f"\t\tBattery {j+1} Charging current (A): {charging_current[j]:.2f}")
             
             if iterative_mode:
                 # Publish updated current values (Publishing forces re-iteration!)
-                feditr.set_pub(fed, pubid, charging_current)
+                feditr.set_pub(fed, pubid, charging_current, deadband=args.deadband)
                 
                 itr += 1
             else:
@@ -242,7 +341,7 @@ if __name__ == "__main__":
         logger.debug(f"SOC Update time {grantedtime}")
         for j in range(0, pub_count):
             # Update SOC
-            added_energy = (charging_current[j] * charging_voltage[j][0] * update_interval / 3600) / 1000
+            added_energy = (charging_current[j] * charging_voltage.latest[j] * update_interval / 3600) / 1000
             current_soc[j] = current_soc[j] + added_energy / batt_list[j]
             logger.debug(f"\tBattery {j+1} - Added energy (kWh): {added_energy:.4f} - SOC: {current_soc[j]:.4f}")
             
@@ -251,11 +350,21 @@ if __name__ == "__main__":
                 soc[pubid[j]] = []
             soc[pubid[j]].append(float(current_soc[j]))
             current_out[j].append(charging_current[j])
+        if scheduler is not None:
+            scheduler.end_step(charging_voltage.latest)
         # Data collection vectors
         time_sim.append(grantedtime)
 
     # Cleaning up HELICS stuff once we've finished the co-simulation.
     destroy_federate(fed)
+    if telemetry is not None:
+        telemetry.write(args.telemetry)
+        logger.info(telemetry.summary())
+    if scheduler is not None:
+        scheduler.write("advanced_iteration_battery_schedule.csv")
+        logger.info(scheduler.summary())
+    if args.deadband is not None:
+        logger.info(feditr.pub_summary())
     # Printing out final results graphs for comparison/diagnostic purposes.
     xaxis = np.array(time_sim) / 3600
     y = []
@@ -131,7 +131,7 @@ if __name__ == "__main__":
     # initialize state
     vinit = 0
     charging_current = [current_update(vinit, current_soc[j]) for j in range(0, pub_count)] # initial state
-    charging_voltage = {}
+    charging_voltage = ItrHistory(sub_count)
 
     hours = 24 * 5
     total_interval = int(60 * 60 * hours)
@@ -175,7 +175,7 @@ if __name__ == "__main__":
         for j in range(0, pub_count):
             # ----- update calculation --------
             # Calculate charging current
-            charging_current[j] = current_update(charging_voltage[j][0], current_soc[j])
+            charging_current[j] = current_update(charging_voltage.latest[j], current_soc[j])
             logger.debug(f"\t\tBattery {j+1} charging current (A): {charging_current[j]:.2f}")
             try:
                 iinit[j][itr] = charging_current[j]
@@ -227,7 +227,7 @@ if __name__ == "__main__":
             
             logger.debug(f"\tCalculation update:")
             for j in range(0, pub_count):
-                charging_current[j] = current_update(charging_voltage[j][0], current_soc[j])
+                charging_current[j] = current_update(charging_voltage.latest[j], current_soc[j])
                 logger.debug(f"\t\tBattery {j+1} Charging current (A): {charging_current[j]:.2f}")
             
             if iterative_mode:
@@ -242,7 +242,7 @@ if __name__ == "__main__":
         logger.debug(f"SOC Update time {grantedtime}")
         for j in range(0, pub_count):
             # Update SOC
-            added_energy = (charging_current[j] * charging_voltage[j][0] * update_interval / 3600) / 1000
+            added_energy = (charging_current[j] * charging_voltage.latest[j] * update_interval / 3600) / 1000
             current_soc[j] = current_soc[j] + added_energy / batt_list[j]
             logger.debug(f"\tBattery {j+1} - Added energy (kWh): {added_energy:.4f} - SOC: {current_soc[j]:.4f}")
             
@@ -12,6 +12,7 @@ intelligence and simply applies a constant charging voltage.
 trevor.hardy@pnnl.gov
 """
 
+import argparse
 import matplotlib.pyplot as plt
 from multiprocessing.sharedctypes import Value
 from tkinter import E
@@ -26,7 +27,6 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
 logger.setLevel(logging.DEBUG)
 
-feditr = FedItr(logger)
 
 def destroy_federate(fed):
     """
@@ -128,7 +128,90 @@ def voltage_update(charger_rating, charging_current, charging_voltage=None, epsi
         
     return charging_voltage
 
+def warm_start(charger_rating, charging_voltage, predicted, change, margin=4, min_width=0.5):
+    """
+    Starts the bisection of a new time step from the predicted voltage with
+    a bracket narrowed around it rather than the full [0, Vr] range. The
+    half-width of the bracket is margin times the last step-to-step change
+    in voltage (at least min_width volts).
+
+    :param charger_rating: Dictionary with the charger's Vr and Ir
+    :param charging_voltage: voltage_update() state, updated in place
+    :param predicted: Predicted voltage
+    :param change: Last step-to-step change in voltage
+    """
+    width = max(margin * change, min_width)
+    V = min(max(predicted, 0), charger_rating["Vr"])
+    charging_voltage["V"] = V
+    charging_voltage["Vmin"] = max(V - width, 0)
+    charging_voltage["Vmax"] = min(V + width, charger_rating["Vr"])
+
+
+def widen_bracket(charger_rating, charging_current, charging_voltage, epsilon=1e-2):
+    """
+    Fallback for a warm-started bracket that does not contain the solution:
+    the bisection runs up against one end of the bracket while the current
+    still calls for moving past it. The bracket is then reset to the full
+    [0, Vr] range, as without a warm start.
+
+    :return: True if the bracket was widened
+    """
+    if ((charging_current < charger_rating["Ir"] - epsilon
+            and charging_voltage["Vmax"] < charger_rating["Vr"]
+            and charging_voltage["Vmax"] - charging_voltage["V"] < epsilon)
+        or (charging_current > charger_rating["Ir"] + epsilon
+            and charging_voltage["Vmin"] > 0
+            and charging_voltage["V"] - charging_voltage["Vmin"] < epsilon)):
+        charging_voltage["Vmin"] = 0
+        charging_voltage["Vmax"] = charger_rating["Vr"]
+        return True
+    return False
+
+
+def accelerate_voltage(accelerator, published, charging_voltage):
+    """
+    Replaces the bisection voltages with the accelerated ones where they fall
+    strictly inside the EV's bisection bracket and step at least as far from
+    the published voltage as the bisection does; otherwise the bisection
+    voltage is kept. Clipping to the bracket instead would re-publish a
+    voltage that has already been tried, and a smaller step than the
+    bisection's changes the currents by less than epsilon: either stops the
+    iteration (convergence is checked on the change in the currents) before
+    the voltage has converged.
+
+    :param accelerator: iterutils.Accelerator
+    :param published: Voltages published in the previous iteration
+    :param charging_voltage: List of voltage_update() states, updated in place
+    """
+    voltages = accelerator(published, [x["V"] for x in charging_voltage])
+    for j, x in enumerate(charging_voltage):
+        if (x["Vmin"] < voltages[j] < x["Vmax"]
+                and abs(voltages[j] - published[j]) >= abs(x["V"] - published[j])):
+            x["V"] = voltages[j]
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Iterative EV charger federate")
+    parser.add_argument("-a", "--accelerator", choices=Accelerator.METHODS, default="none",
+                        help="Convergence acceleration applied to the published voltages")
+    parser.add_argument("-w", "--window", type=int, default=3,
+                        help="Number of past iterations used by Anderson mixing")
+    parser.add_argument("--telemetry", default=None, metavar="PREFIX",
+                        help="Record every time request of the main loop and write them to"
+                             " <PREFIX>.npz and <PREFIX>_summary.txt at the end of the run"
+                             " (e.g. advanced_iteration_charger_telemetry)")
+    parser.add_argument("--warm_start", choices=["none", "last", "linear", "quadratic"], default="none",
+                        help="Start each time step from a voltage predicted from the last converged"
+                             " voltages with a narrowed bisection bracket")
+    parser.add_argument("--deadband", type=float, default=None,
+                        help="Only publish a charging voltage if it changed by more than this (V)"
+                             " since it was last published (by default every voltage is published"
+                             " every iteration)")
+    parser.add_argument("--publish_final", action="store_true",
+                        help="With --deadband, publish the voltages held back by the deadband once"
+                             " the charging currents have converged")
+    args = parser.parse_args()
+    telemetry = ItrTelemetry() if args.telemetry else None
+    feditr = FedItr(logger, telemetry=telemetry)
     np.random.seed(1490)
 
     ##############  Registering  federate from json  ##########################
@@ -174,13 +257,22 @@ if __name__ == "__main__":
     #initialize state
     iinit = 0
     charging_voltage = [voltage_update(charger_ratings[j], iinit, quiet=True) for j in range(0, pub_count)]
-    charging_current = {}
+    charging_current = ItrHistory(sub_count)
+    accelerator = Accelerator(pub_count, args.accelerator, window=args.window)
+    logger.info(f"Convergence acceleration: {args.accelerator}")
+    predictor = None
+    if args.warm_start != "none":
+        order = {"last": 0, "linear": 1, "quadratic": 2}[args.warm_start]
+        predictor = Predictor(pub_count, order)
+    logger.info(f"Warm start: {args.warm_start}")
+    widened = 0
 
     # Data collection lists
     time_sim = []
     power = []
     voltage_out = {j: [] for j in range(0, pub_count)}
     vinit = {j: [] for j in range(0, pub_count)}
+    iterations = []
     ##############  INITIALIZATION  ##################################
     # initialize published voltaged
     feditr.set_pub(fed, pubid, [x["V"] for x in charging_voltage], "EV", init=True)
@@ -209,10 +301,15 @@ if __name__ == "__main__":
         
         # Calculate new voltages based on received currents
         logger.debug("\tCalculation Update:")
+        if itr == 0:
+            accelerator.reset()
+        published = [x["V"] for x in charging_voltage]
         for j in range(0, pub_count):
             # ----- update calculation --------
             # Calculate charging voltage
-            charging_voltage[j] = voltage_update(charger_ratings[j], charging_current[j][0], charging_voltage[j])
+            charging_voltage[j] = voltage_update(charger_ratings[j], charging_current.latest[j], charging_voltage[j])
+        accelerate_voltage(accelerator, published, charging_voltage)
+        for j in range(0, pub_count):
             logger.debug(f"\t\tEV {j+1} charging voltage (V): " "{:.2f}".format(charging_voltage[j]["V"]))
             try:
                 vinit[j][itr] = charging_voltage[j]["V"]
@@ -230,19 +327,29 @@ if __name__ == "__main__":
     ########## Main co-simulation loop ########################################
     # As long as granted time is in the time range to be simulated...
     while grantedtime < total_interval:
-        # Publication needed so we can actually iterate
-        feditr.set_pub(fed, pubid, [x["V"] for x in charging_voltage])
-
         # Time request for the next physical interval to be simulated
         requested_time = grantedtime + update_interval
-        
-        # reset Vmin and Vmax
-        for j in range(0, pub_count):
-            charging_voltage[j]["Vmin"] = 0
-            charging_voltage[j]["Vmax"] = charger_ratings[j]["Vr"]
+
+        warm_bracket = [False] * pub_count
+        if predictor is not None and predictor.change() is not None:
+            # Warm start from the predicted voltages
+            predicted = predictor.predict()
+            change = predictor.change()
+            for j in range(0, pub_count):
+                warm_start(charger_ratings[j], charging_voltage[j], predicted[j], change[j])
+                warm_bracket[j] = True
+        else:
+            # reset Vmin and Vmax
+            for j in range(0, pub_count):
+                charging_voltage[j]["Vmin"] = 0
+                charging_voltage[j]["Vmax"] = charger_ratings[j]["Vr"]
+
+        # Publication needed so we can actually iterate
+        feditr.set_pub(fed, pubid, [x["V"] for x in charging_voltage], force=True)
 
         itr = 0
         itr_flag = h.helics_iteration_request_iterate_if_needed
+        accelerator.reset()
         while True:
             grantedtime, itr_state = feditr.request_time(fed, requested_time, itr, itr_flag, iterative_mode=iterative_mode)
             if ((itr_state == h.helics_iteration_result_next_step) and iterative_mode):
@@ -259,33 +366,49 @@ if __name__ == "__main__":
                 # Check convergence
                 error = feditr.check_error(charging_current)
                 logger.debug(f"\tError = {error}")
-                if (error < epsilon) and (itr > 0):
+                converged = (error < epsilon) and (itr > 0)
+                if converged:
                     # no further iteration necessary
+                    if args.publish_final:
+                        feditr.set_pub(fed, pubid, [x["V"] for x in charging_voltage], final=True)
                     continue
                 else:
                     pass
             
             logger.debug("\tCalculation Update:")
+            published = [x["V"] for x in charging_voltage]
             for j in range(0, pub_count):
                 # Calculate charging voltage
-                charging_voltage[j] = voltage_update(charger_ratings[j], charging_current[j][0], charging_voltage[j])
+                # The bracket is widened at most once per time step so the
+                #   bisection falls back to the full bracket
+                if warm_bracket[j] and widen_bracket(charger_ratings[j], charging_current.latest[j], charging_voltage[j]):
+                    logger.debug(f"\t\tEV {j+1} bisection bracket widened")
+                    warm_bracket[j] = False
+                    widened += 1
+                charging_voltage[j] = voltage_update(charger_ratings[j], charging_current.latest[j], charging_voltage[j])
+            accelerate_voltage(accelerator, published, charging_voltage)
+            for j in range(0, pub_count):
                 logger.debug(f"\t\tEV {j+1} charging voltage (V): " "{:.2f}".format(charging_voltage[j]["V"]))
 
             if iterative_mode:
                 # Publish updated voltage values (Publishing forces re-iteration!)
-                feditr.set_pub(fed, pubid, [x["V"] for x in charging_voltage])
+                feditr.set_pub(fed, pubid, [x["V"] for x in charging_voltage], deadband=args.deadband)
                 
                 itr += 1
             else:
                 break
 
+        iterations.append(itr)
+        if predictor is not None:
+            predictor.update([x["V"] for x in charging_voltage])
+
         # Calculate the total power required by all chargers. This is the
         #   primary metric of interest, to understand the power profile
         #   and capacity requirements required for this charging garage.
         total_power = 0
         for j in range(0, pub_count):
             voltage_out[j].append(charging_voltage[j]["V"])
-            total_power += charging_current[j][0]*charging_voltage[j]["V"]/1000
+            total_power += charging_current.latest[j]*charging_voltage[j]["V"]/1000
         logger.debug(f"\tTotal Power Draw {total_power:0.2f} kW")
 
         # Data collection vectors
@@ -294,6 +417,15 @@ if __name__ == "__main__":
 
     # Cleaning up HELICS stuff once we've finished the co-simulation.
     destroy_federate(fed)
+    if telemetry is not None:
+        telemetry.write(args.telemetry)
+        logger.info(telemetry.summary())
+    logger.info(f"Iterations per time step ({args.accelerator}): mean {np.mean(iterations):.2f}"
+                f" - max {max(iterations)} - total {sum(iterations)} over {len(iterations)} time steps")
+    if predictor is not None:
+        logger.info(f"Bisection bracket widened {widened} times")
+    if args.deadband is not None:
+        logger.info(feditr.pub_summary())
 
     # Output graph showing the charging profile for each of the charging
     #   terminals
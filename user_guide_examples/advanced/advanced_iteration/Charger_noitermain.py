@@ -175,7 +175,7 @@ if __name__ == "__main__":
     #initialize state
     iinit = 0
     charging_voltage = [voltage_update(charger_ratings[j], iinit, quiet=True) for j in range(0, pub_count)]
-    charging_current = {}
+    charging_current = ItrHistory(sub_count)
 
     # Data collection lists
     time_sim = []
@@ -213,7 +213,7 @@ if __name__ == "__main__":
         for j in range(0, pub_count):
             # ----- update calculation --------
             # Calculate charging voltage
-            charging_voltage[j] = voltage_update(charger_ratings[j], charging_current[j][0], charging_voltage[j])
+            charging_voltage[j] = voltage_update(charger_ratings[j], charging_current.latest[j], charging_voltage[j])
             logger.debug(f"\t\tEV {j+1} charging voltage (V): " "{:.2f}".format(charging_voltage[j]["V"]))
             try:
                 vinit[j][itr] = charging_voltage[j]["V"]
@@ -269,7 +269,7 @@ if __name__ == "__main__":
             logger.debug("\tCalculation Update:")
             for j in range(0, pub_count):
                 # Calculate charging voltage
-                charging_voltage[j] = voltage_update(charger_ratings[j], charging_current[j][0], charging_voltage[j])
+                charging_voltage[j] = voltage_update(charger_ratings[j], charging_current.latest[j], charging_voltage[j])
                 logger.debug(f"\t\tEV {j+1} charging voltage (V): " "{:.2f}".format(charging_voltage[j]["V"]))
 
             if iterative_mode:
@@ -286,7 +286,7 @@ if __name__ == "__main__":
         total_power = 0
         for j in range(0, pub_count):
             voltage_out[j].append(charging_voltage[j]["V"])
-            total_power += charging_current[j][0]*charging_voltage[j]["V"]/1000
+            total_power += charging_current.latest[j]*charging_voltage[j]["V"]/1000
         logger.debug(f"\tTotal Power Draw {total_power:0.2f} kW")
 
         # Data collection vectors
@@ -6,58 +6,489 @@ These are the functions common to both (all) federates, which are necessary to a
 iteration.
 The are grouped here for readability, reproduceability and to ensure uniform alteration.
 """
+import csv
+import logging
+import time
 import helics as h
 import matplotlib.pyplot as plt
+import numpy as np
+
+NORMS = {"l1": 1, "l2": 2, "linf": np.inf}
+
+class ItrHistory:
+    """
+    Iteration history of a set of inputs, kept in a preallocated
+    (n_inputs x depth) array used as a ring buffer: each iteration
+    overwrites the column holding the oldest values rather than shifting
+    the rest. `latest` holds the values of the current iteration and
+    `residual()` the change since the previous one for all inputs at once.
+    """
+    def __init__(self, n, depth=2):
+        if depth < 2:
+            raise ValueError("ItrHistory: depth must be at least 2 to compute a residual")
+        self.buffer = np.zeros((n, depth))
+        self.depth = depth
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.buffer.shape[0]
+
+    def reset(self, value=0):
+        """Fill the whole history with value, e.g. at the start of a time step"""
+        self.buffer[:] = value
+        self.head = 0
+        self.count = 0
+
+    def next_column(self):
+        """Advance the ring buffer and return the column (view) to fill for this iteration"""
+        self.head = (self.head + 1) % self.depth
+        self.count += 1
+        return self.buffer[:, self.head]
+
+    def push(self, values):
+        self.next_column()[:] = values
+
+    @property
+    def latest(self):
+        return self.buffer[:, self.head]
+
+    def previous(self, k=1):
+        """Values from k iterations ago (k < depth)"""
+        return self.buffer[:, (self.head - k) % self.depth]
+
+    def newest_first(self, j):
+        """History of input j ordered from the latest value back"""
+        return self.buffer[j, (self.head - np.arange(self.depth)) % self.depth]
+
+    def residual(self):
+        return self.latest - self.previous()
+
+    def error(self, norm="l1"):
+        return float(np.linalg.norm(self.residual(), NORMS[norm]))
+
+
+class Accelerator:
+    """
+    Convergence acceleration of a fixed-point iteration x <- g(x) carried out
+    across federates, applied to the values a federate publishes between
+    iterations. Given the values published last iteration (x) and the newly
+    calculated ones (gx), __call__() returns the values to publish instead:
+
+    none     - gx unchanged
+    aitken   - Aitken delta-squared (dynamic relaxation) x + omega * (gx - x)
+               with a relaxation factor omega per signal, updated every
+               iteration from the signal's last two residuals
+    anderson - Anderson mixing over the last `window` iterations: the
+               combination of past updates that minimizes the residual
+               in the least squares sense
+
+    reset() must be called at the start of every time step.
+    """
+    METHODS = ("none", "aitken", "anderson")
+
+    def __init__(self, n, method="none", window=3, omega=1.0, omega_max=2.0):
+        if method not in self.METHODS:
+            raise ValueError(f"Accelerator: unknown method {method}, expected one of {list(self.METHODS)}")
+        self.method = method
+        self.window = window
+        self.omega0 = omega
+        self.omega_max = omega_max
+        # differences of the residuals (gx - x) and of gx between the
+        #   last window+1 iterations, used as a ring buffer
+        self.dR = np.zeros((n, window))
+        self.dG = np.zeros((n, window))
+        self.reset()
+
+    def reset(self):
+        self.omega = np.full(self.dR.shape[0], self.omega0)
+        self.r_prev = None
+        self.g_prev = None
+        self.count = 0
+
+    def __call__(self, x, gx):
+        x = np.asarray(x, dtype=float)
+        gx = np.asarray(gx, dtype=float)
+        r = gx - x
+        if self.method == "none":
+            out = gx
+        elif self.method == "aitken":
+            out = self._aitken(x, r)
+        else:
+            out = self._anderson(gx, r)
+        self.r_prev = r
+        self.g_prev = gx
+        self.count += 1
+        return out
+
+    def _aitken(self, x, r):
+        if self.r_prev is not None:
+            dr = r - self.r_prev
+            update = dr != 0
+            omega = -self.omega[update] * self.r_prev[update] / dr[update]
+            self.omega[update] = np.clip(omega, -self.omega_max, self.omega_max)
+        return x + self.omega * r
+
+    def _anderson(self, gx, r):
+        if self.r_prev is None:
+            return gx
+        col = (self.count - 1) % self.window
+        self.dR[:, col] = r - self.r_prev
+        self.dG[:, col] = gx - self.g_prev
+        m = min(self.count, self.window)
+        gamma = np.linalg.lstsq(self.dR[:, :m], r, rcond=None)[0]
+        return gx - self.dG[:, :m] @ gamma
+
+
+class Predictor:
+    """
+    Predicts the converged values of the next time step from those of the
+    last few steps for warm-starting an iterative solve: the last value
+    (order 0), a linear (order 1) or a quadratic (order 2) extrapolation,
+    assuming equally spaced time steps. Until enough steps have been
+    recorded the highest order possible is used. change() gives the size of
+    the last step-to-step change of each signal, as a measure of how far off
+    the prediction might be.
+    """
+    # Extrapolation coefficients applied to the values of the last steps,
+    #   newest first
+    COEFFS = {0: [1.0], 1: [2.0, -1.0], 2: [3.0, -3.0, 1.0]}
+
+    def __init__(self, n, order=1):
+        if order not in self.COEFFS:
+            raise ValueError(f"Predictor: order must be one of {list(self.COEFFS)}")
+        self.order = order
+        self.history = ItrHistory(n, depth=max(order + 1, 2))
+
+    def update(self, values):
+        """Record the converged values of a time step"""
+        self.history.push(values)
+
+    def available_order(self):
+        return min(self.order, self.history.count - 1)
+
+    def predict(self):
+        if self.history.count == 0:
+            return None
+        coeffs = self.COEFFS[self.available_order()]
+        return sum(c * self.history.previous(k) for k, c in enumerate(coeffs))
+
+    def change(self):
+        if self.history.count < 2:
+            return None
+        return np.abs(self.history.residual())
+
+
+class ItrScheduler:
+    """
+    Chooses the convergence tolerance and the iteration budget of every time
+    step from how fast the converged state has been changing between time
+    steps (the largest change of any signal over the last step):
+
+    - the tolerance is epsilon scaled by rate_ref / rate, i.e. tightened when
+      the state changes quickly and relaxed when it changes slowly, within
+      [epsilon_min, epsilon_max]
+    - the number of iterations per time step is capped at max_itr
+    - once the change has stayed below quasi_static_rate for
+      quasi_static_steps time steps the system is considered quasi-static
+      and the time step gets a single update from the last converged state
+      (max_itr is 1); after max_quasi_static such steps in a row a fully
+      iterated step is forced to check the state has not drifted
+
+    Every decision is recorded in `decisions` (one dictionary per time step)
+    and can be written out with write().
+    """
+    FIELDS = ("time", "mode", "rate", "epsilon", "max_itr", "iterations", "error", "stopped_by")
+
+    def __init__(self, epsilon=1e-2, epsilon_min=1e-3, epsilon_max=1e-1, rate_ref=1.0, max_itr=20,
+                 quasi_static_rate=1e-3, quasi_static_steps=3, max_quasi_static=10):
+        self.epsilon = epsilon
+        self.epsilon_min = epsilon_min
+        self.epsilon_max = epsilon_max
+        self.rate_ref = rate_ref
+        self.max_itr = max_itr
+        self.quasi_static_rate = quasi_static_rate
+        self.quasi_static_steps = quasi_static_steps
+        self.max_quasi_static = max_quasi_static
+        self.decisions = []
+        self._state = None
+        self._rate = None
+        self._slow_steps = 0
+        self._quasi_static_run = 0
+
+    def start_step(self, time):
+        """Decide on the tolerance and iteration budget of the time step"""
+        rate = self._rate
+        if rate is None:
+            mode, epsilon, max_itr = "iterate", self.epsilon, self.max_itr
+        elif (self._slow_steps >= self.quasi_static_steps
+                and self._quasi_static_run < self.max_quasi_static):
+            mode, epsilon, max_itr = "quasi-static", self.epsilon_max, 1
+        else:
+            scale = self.rate_ref / max(rate, 1e-12)
+            epsilon = min(max(self.epsilon * scale, self.epsilon_min), self.epsilon_max)
+            mode, max_itr = "iterate", self.max_itr
+        if mode == "quasi-static":
+            self._quasi_static_run += 1
+        else:
+            self._quasi_static_run = 0
+        # stopped_by stays "federation" if HELICS moves on to the next time
+        #   step before stop() ends the iteration, i.e. no federate had
+        #   anything new to publish
+        self.decisions.append({"time": time, "mode": mode, "rate": rate, "epsilon": epsilon,
+                               "max_itr": max_itr, "iterations": 0, "error": None,
+                               "stopped_by": "federation"})
+        return self.decisions[-1]
+
+    def stop(self, itr, error):
+        """
+        :return: True if the time step needs no further iterations, either
+            because the error is within tolerance or the budget is used up
+        """
+        decision = self.decisions[-1]
+        decision["iterations"] = itr
+        decision["error"] = error
+        if itr == 0:
+            return False
+        if error < decision["epsilon"]:
+            decision["stopped_by"] = "tolerance"
+            return True
+        if itr >= decision["max_itr"]:
+            decision["stopped_by"] = "budget"
+            return True
+        return False
+
+    def end_step(self, state):
+        """Record the converged state of the time step"""
+        state = np.asarray(state, dtype=float)
+        if self._state is not None:
+            self._rate = float(np.max(np.abs(state - self._state)))
+            if self._rate < self.quasi_static_rate:
+                self._slow_steps += 1
+            else:
+                self._slow_steps = 0
+        self._state = state.copy()
+
+    def summary(self):
+        if not self.decisions:
+            return "No time steps scheduled"
+        modes = [d["mode"] for d in self.decisions]
+        stopped = [d["stopped_by"] for d in self.decisions]
+        return (f"Time steps: {len(modes)} - quasi-static {modes.count('quasi-static')}"
+                f" - stopped by tolerance {stopped.count('tolerance')} - by iteration budget {stopped.count('budget')}"
+                f" - by the federation {stopped.count('federation')}")
+
+    def write(self, path):
+        with open(path, "w", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.decisions)
+
+
+class ItrTelemetry:
+    """
+    Per-iteration record of the main co-simulation loop, filled in by
+    FedItr. Every time request is one row:
+
+    time         - requested time
+    itr          - iteration number within the time step
+    status       - iteration result returned by HELICS
+    request_wall - wall time spent in the time request (s)
+    compute_wall - wall time between the previous time request and this
+                   one, i.e. reading inputs, calculating and publishing (s)
+    residual     - error calculated by check_error() in the iteration
+                   (nan if it was not checked)
+
+    write() saves the columns to a compressed .npz file, together with the
+    per time step totals from steps(), and writes summary() to a text file.
+    """
+    COLUMNS = ("time", "itr", "status", "request_wall", "compute_wall", "residual")
+
+    def __init__(self):
+        self.rows = {c: [] for c in self.COLUMNS}
+        self._last_request_end = None
+
+    def __len__(self):
+        return len(self.rows["time"])
+
+    def record_request(self, requested_time, itr, status, start, end):
+        rows = self.rows
+        rows["time"].append(requested_time)
+        rows["itr"].append(itr)
+        rows["status"].append(status)
+        rows["request_wall"].append(end - start)
+        if self._last_request_end is None:
+            rows["compute_wall"].append(np.nan)
+        else:
+            rows["compute_wall"].append(start - self._last_request_end)
+        rows["residual"].append(np.nan)
+        self._last_request_end = end
+
+    def record_residual(self, error):
+        # Residuals calculated before the first time request (i.e. during
+        #   initialization) have no row to go with
+        if self.rows["residual"]:
+            self.rows["residual"][-1] = error
+
+    def columns(self):
+        return {c: np.array(v) for c, v in self.rows.items()}
+
+    def steps(self):
+        """
+        :return: Dictionary of per time step arrays: time, iterations,
+            number of time requests, request_wall, compute_wall and the
+            final residual
+        """
+        cols = self.columns()
+        times, index = np.unique(cols["time"], return_inverse=True)
+        iterations = np.zeros(len(times), dtype=int)
+        np.maximum.at(iterations, index, cols["itr"])
+        # The last time request of a step has no residual of its own; use
+        #   the last one that was checked
+        final_residual = np.full(len(times), np.nan)
+        checked = np.flatnonzero(~np.isnan(cols["residual"]))
+        final_residual[index[checked]] = cols["residual"][checked]
+        return {"time": times,
+                "iterations": iterations,
+                "requests": np.bincount(index),
+                "request_wall": np.bincount(index, weights=cols["request_wall"]),
+                "compute_wall": np.bincount(index, weights=np.nan_to_num(cols["compute_wall"])),
+                "final_residual": final_residual}
+
+    def summary(self, top=10):
+        if len(self) == 0:
+            return "No iterations recorded"
+        steps = self.steps()
+        wall = steps["request_wall"] + steps["compute_wall"]
+        total_wall = wall.sum()
+        iterations = steps["iterations"]
+        lines = [f"Time steps: {len(iterations)}",
+                 f"Iterations: {iterations.sum()} - time requests: {steps['requests'].sum()}",
+                 f"Iterations per time step: mean {iterations.mean():.2f} - p95 {np.percentile(iterations, 95):.0f} - max {iterations.max()}",
+                 f"Wall time: {total_wall:.3f} s - in time requests {steps['request_wall'].sum():.3f} s"
+                 f" ({100 * steps['request_wall'].sum() / total_wall:.1f}%)",
+                 f"Wall time per time request: mean {total_wall / steps['requests'].sum() * 1e3:.3f} ms",
+                 f"Time steps with the most wall time:",
+                 f"\t{'time':>10} {'itrs':>5} {'wall (ms)':>10} {'request (ms)':>13} {'residual':>10}"]
+        for k in np.argsort(wall)[::-1][:top]:
+            lines.append(f"\t{steps['time'][k]:>10.0f} {iterations[k]:>5} {wall[k] * 1e3:>10.3f}"
+                         f" {steps['request_wall'][k] * 1e3:>13.3f} {steps['final_residual'][k]:>10.3g}")
+        return "\n".join(lines)
+
+    def write(self, basename):
+        """Writes <basename>.npz and <basename>_summary.txt"""
+        steps = self.steps()
+        np.savez_compressed(f"{basename}.npz", **self.columns(),
+                            **{f"step_{k}": v for k, v in steps.items()})
+        with open(f"{basename}_summary.txt", "w") as fh:
+            fh.write(self.summary() + "\n")
+
+
 class FedItr:
-    def __init__(self, logger):
+    """
+    Time requests, publications and subscriptions of an iterating federate.
+
+    Every publication makes the subscribers iterate again, so set_pub() can
+    hold back values that have barely changed: with set_pub(...,
+    deadband=d) (a single value or one per publication) a value is only
+    published if it differs from the last value published by more than d.
+    The default (None) publishes every value every time. The deadband is
+    given per call so the initialization and the start of each time step
+    can publish everything with the same FedItr. set_pub(..., force=True)
+    publishes every value regardless, as needed at the start of a time step
+    for the federation to iterate at all. set_pub(..., final=True) publishes
+    just the values held back, e.g. once a federate has converged, so the
+    subscribers end the time step on the exact values.
+    """
+    def __init__(self, logger, norm="l1", telemetry=None):
+        if norm not in NORMS:
+            raise ValueError(f"FedItr: unknown norm {norm}, expected one of {list(NORMS)}")
         self.logger = logger
+        self.norm = norm
+        self.telemetry = telemetry
+        self.last_pub = None
+        self.published = 0
+        self.held_back = 0
 
     def check_error(self, dState):
-        return sum([abs(vals[0] - vals[1]) for vals in dState.values()])
+        error = dState.error(self.norm)
+        if self.telemetry is not None:
+            self.telemetry.record_residual(error)
+        return error
 
     def request_time(self, fed, requested_time, itr, itr_flag, iterative_mode=True):
         if itr == 0:
             s = "=====================\n"
         else:
             s = "---------------------\n"
+        # Only timed when there is telemetry to record it
+        clock = time.perf_counter if self.telemetry is not None else float
+        start = clock()
         if not iterative_mode:
             grantedtime = h.helicsFederateRequestTime(fed, requested_time)
+            end = clock()
+            itr_state = h.helics_iteration_result_next_step
             self.logger.debug(f"{s}Requested time {requested_time} - Granted time {grantedtime}")
-            return grantedtime, h.helics_iteration_result_next_step
         else:
             grantedtime, itr_state = h.helicsFederateRequestTimeIterative(fed,requested_time,itr_flag)
+            end = clock()
             self.logger.debug(f"{s}Requested time: {requested_time} - Granted time: {grantedtime} - itr: {itr} - itr request: {ireq(itr_flag)} - itr status: {ires(itr_state)}")
-            return grantedtime, itr_state
+        if self.telemetry is not None:
+            self.telemetry.record_request(requested_time, itr, itr_state, start, end)
+        return grantedtime, itr_state
 
-    def set_pub(self, fed, pubid, pubvals, nametyp=None, init=False):
+    def set_pub(self, fed, pubid, pubvals, nametyp=None, init=False, final=False, force=False, deadband=None):
         if init:
             self.logger.info("=== Entering HELICS Initialization mode")
             h.helicsFederateEnterInitializingMode(fed)
         else:
             self.logger.debug(f"\tPublications: (helics mode: {fedstate(h.helicsFederateGetState(fed))})")
         pub_count = h.helicsFederateGetPublicationCount(fed)
-        for j in range(0, pub_count):
-            h.helicsPublicationPublishDouble(pubid[j], pubvals[j])
+        values = np.array([pubvals[j] for j in range(0, pub_count)], dtype=float)
+        if init or self.last_pub is None:
+            self.last_pub = values.copy()
+            send = np.ones(pub_count, dtype=bool)
+        elif force:
+            send = np.ones(pub_count, dtype=bool)
+        elif final:
+            send = values != self.last_pub
+        elif deadband is None:
+            send = np.ones(pub_count, dtype=bool)
+        else:
+            changed = values != self.last_pub
+            send = np.abs(values - self.last_pub) > deadband
+            self.held_back += int(np.count_nonzero(changed & ~send))
+        for j in np.flatnonzero(send):
+            h.helicsPublicationPublishDouble(pubid[j], values[j])
+            self.last_pub[j] = values[j]
+            self.published += 1
             if init:
                 self.logger.debug(f"\t{nametyp} {j+1} published {h.helicsPublicationGetName(pubid[j])} with value " 
-                    "{:.2f}".format(pubvals[j]))
+                    "{:.2f}".format(values[j]))
             else:
                 self.logger.debug(f"\t\tPublished {h.helicsPublicationGetName(pubid[j])} with value " 
-                    "{:.2f}".format(pubvals[j]))
+                    "{:.2f}".format(values[j]))
+
+    def pub_summary(self):
+        return f"Values published: {self.published} - held back by the deadband: {self.held_back}"
 
     def get_sub(self, fed, subid, itr, valarray, valinit, nametyp, proptyp):
-        self.logger.debug("\tSubscriptsion:")
-        sub_count = h.helicsFederateGetInputCount(fed)
-        for j in range(0, sub_count):
-            x = h.helicsInputGetDouble((subid[j]))
-            self.logger.debug(f"\t\t{nametyp} {j+1} received {proptyp} {x:.2f}" 
-                        f" from input {h.helicsInputGetTarget(subid[j])}")
-            if itr == 0:
-                valarray[j] = [valinit] * 2
-            else:
-                valarray[j].insert(0, valarray[j].pop())
-            valarray[j][0] = x
-            self.logger.debug(f"\t\t\t{proptyp} array={valarray[j]}")
+        """
+        Read all inputs into the next column of the ItrHistory valarray.
+        On the first iteration the history is reset to valinit so the
+        residual is measured against the initial value.
+        """
+        if itr == 0:
+            valarray.reset(valinit)
+        column = valarray.next_column()
+        for j in range(0, len(valarray)):
+            column[j] = h.helicsInputGetDouble((subid[j]))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("\tSubscriptsion:")
+            for j in range(0, len(valarray)):
+                self.logger.debug(f"\t\t{nametyp} {j+1} received {proptyp} {column[j]:.2f}" 
+                            f" from input {h.helicsInputGetTarget(subid[j])}")
+                self.logger.debug(f"\t\t\t{proptyp} array={valarray.newest_first(j)}")
 
 
 def ires(n):
@@ -26,6 +26,7 @@ import helics as h
 import logging
 import numpy as np
 
+from input_reducer import InputReducer
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
@@ -140,6 +141,8 @@ if __name__ == "__main__":
     charging_voltage = 240
     currentsoc = {}
 
+    reducer = InputReducer(subid.values(), 'sum')
+
     # Data collection lists
     time_sim = []
     power = []
@@ -168,11 +171,11 @@ if __name__ == "__main__":
         grantedtime = h.helicsFederateRequestTime (fed, requested_time)
         logger.debug(f'Granted time {grantedtime}')
 
-        # Only one (multi-source) input defined so we just grab that
-        #   single value. All the individual published values are
-        #   aggregated by the method defined in the config file for this
-        #   input.
-        charging_current = h.helicsInputGetDouble((subid[0]))
+        # Only one (multi-source) input is defined in ChargerConfig.json so
+        #   this is just its value, aggregated by the method defined in the
+        #   config file. If the config instead subscribes to each battery
+        #   current separately they are summed here.
+        charging_current = reducer.reduce()
 
 
         # Calculate the total power required by all chargers. This is the
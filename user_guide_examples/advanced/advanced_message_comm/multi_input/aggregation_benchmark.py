@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Benchmark comparing aggregation by HELICS multi-source inputs with
+aggregation in Python, as a guide to laying out feeder-level aggregation
+(e.g. the total charging current of a garage as in Charger.py). For every
+number of sources N, a two-federate federation (aggregation_federates.py)
+is generated and run once per mode:
+
+    sum, max   - one multi-source input, aggregated by HELICS
+    vectorize  - one multi-source input gathering a vector, summed by numpy
+    python     - N separate inputs summed by input_reducer.InputReducer
+
+The registration time, time to enter executing mode, per-step grant time
+and the time the sink spends reading and aggregating its inputs are
+written to "aggregation_benchmark_results.csv" in the output directory,
+along with whether the sink's final aggregate was correct.
+
+    python aggregation_benchmark.py --num_sources 10 100 1000 10000
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+MODES = ['sum', 'max', 'vectorize', 'python']
+
+script_path = os.path.dirname(os.path.realpath(__file__))
+
+
+def write_json(path, data):
+    with open(path, 'w') as fh:
+        json.dump(data, fh, indent=2)
+
+
+def read_results(case_dir, role):
+    path = os.path.join(case_dir, f'results_{role}.json')
+    if not os.path.exists(path):
+        logger.warning(f'No results found for {role} in {case_dir}')
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def build_case(case_dir, mode, num_sources, steps):
+    '''
+    Writes the runner file for a single benchmark case.
+
+    :return: Path to the runner file
+    '''
+    os.makedirs(case_dir, exist_ok=True)
+    for role in ('source', 'sink'):
+        path = os.path.join(case_dir, f'results_{role}.json')
+        if os.path.exists(path):
+            os.remove(path)
+    feds = os.path.join(script_path, 'aggregation_federates.py')
+    common = f'-m {mode} -n {num_sources} -s {steps}'
+    runner = {
+        'name': f'aggregation_benchmark_{mode}_{num_sources}',
+        'broker': True,
+        'federates': [
+            {'directory': case_dir,
+             'exec': f'python -u {feds} source {common}',
+             'host': 'localhost',
+             'name': 'source'},
+            {'directory': case_dir,
+             'exec': f'python -u {feds} sink {common}',
+             'host': 'localhost',
+             'name': 'sink'}
+        ]
+    }
+    runner_path = os.path.join(case_dir, 'runner.json')
+    write_json(runner_path, runner)
+    return runner_path
+
+
+def run_case(case_dir, mode, num_sources, steps):
+    '''
+    Runs a single benchmark case and collects the results.
+
+    :return: Dictionary with one row of benchmark results
+    '''
+    runner_path = build_case(case_dir, mode, num_sources, steps)
+    logger.info(f'Running {mode} with {num_sources} sources for {steps} steps')
+    wall_start = time.perf_counter()
+    status = subprocess.call(f'helics run --path={runner_path}', shell=True)
+    run_time = time.perf_counter() - wall_start
+
+    source = read_results(case_dir, 'source')
+    sink = read_results(case_dir, 'sink')
+    return {'mode': mode,
+            'num_sources': num_sources,
+            'steps': steps,
+            'status': status,
+            'run_time': run_time,
+            'sink_register_time': sink.get('register_time'),
+            'source_enter_exec_time': source.get('enter_exec_time'),
+            'sink_enter_exec_time': sink.get('enter_exec_time'),
+            'publish_time_mean': source.get('publish_time', {}).get('mean'),
+            'sink_grant_time_mean': sink.get('grant_time', {}).get('mean'),
+            'aggregate_time_mean': sink.get('aggregate_time', {}).get('mean'),
+            'aggregate_time_p95': sink.get('aggregate_time', {}).get('p95'),
+            'correct': sink.get('correct')}
+
+
+def main(args):
+    rows = []
+    for num_sources in args.num_sources:
+        for mode in args.modes:
+            case_dir = os.path.join(os.path.realpath(args.out_dir),
+                                    f'{mode}_{num_sources}')
+            rows.append(run_case(case_dir, mode, num_sources, args.steps))
+    df = pd.DataFrame(rows)
+    results_path = os.path.join(args.out_dir,
+                                'aggregation_benchmark_results.csv')
+    df.to_csv(results_path, index=False)
+    logger.info(f'\n{df.to_string(index=False)}')
+    logger.info(f'Results written to {results_path}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare HELICS multi-input and Python aggregation')
+    parser.add_argument('-n', '--num_sources', nargs='+', type=int,
+                        default=[10, 100, 1000, 10000])
+    parser.add_argument('-s', '--steps', type=int, default=10,
+                        help='Number of time steps the source publishes')
+    parser.add_argument('-m', '--modes', nargs='+', choices=MODES,
+                        default=MODES)
+    parser.add_argument('-o', '--out_dir',
+                        default=os.path.join(script_path, 'runs'))
+    args = parser.parse_args()
+    os.makedirs(args.out_dir, exist_ok=True)
+    main(args)
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Source and sink federates used by aggregation_benchmark.py. The source
+publishes N doubles every time step; the sink aggregates them using one of
+four layouts:
+
+    sum, max   - one multi-source input subscribed to all N publications
+                 with HELICS doing the aggregation
+    vectorize  - one multi-source input gathering the N values into a
+                 vector which is summed with numpy
+                 (input_reducer.reduce_vectorized_input())
+    python     - N single-source inputs summed (max for --reduction max)
+                 by an input_reducer.InputReducer
+
+Publication k sends k + t at time t so the sink can check the aggregate it
+receives on its last time step. Each federate times its registration,
+entering executing mode and every time request and the sink also times
+reading and reducing its inputs; the statistics are written to
+"results_<role>.json" in the working directory.
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import helics as h
+import numpy as np
+
+from input_reducer import InputReducer, reduce_vectorized_input
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+MULTI_INPUT_METHODS = {'sum': h.HELICS_MULTI_INPUT_SUM_OPERATION,
+                       'max': h.HELICS_MULTI_INPUT_MAX_OPERATION,
+                       'vectorize': h.HELICS_MULTI_INPUT_VECTORIZE_OPERATION}
+
+
+def destroy_federate(fed):
+    '''
+    As part of ending a HELICS co-simulation it is good housekeeping to
+    formally destroy a federate. Doing so informs the rest of the
+    federation that it is no longer a part of the co-simulation and they
+    should proceed without it (if applicable).
+
+    :param fed: Federate to be destroyed
+    :return: (none)
+    '''
+    status = h.helicsFederateDisconnect(fed)
+    h.helicsFederateDestroy(fed)
+    logger.info('Federate finalized')
+
+
+def timing_stats(samples):
+    '''
+    :param samples: List of durations (seconds)
+    :return: Dictionary of summary statistics
+    '''
+    if not samples:
+        return {'count': 0}
+    samples = np.array(samples)
+    return {'count': int(samples.size),
+            'mean': float(samples.mean()),
+            'p50': float(np.percentile(samples, 50)),
+            'p95': float(np.percentile(samples, 95)),
+            'max': float(samples.max())}
+
+
+def write_results(role, results):
+    with open(f'results_{role}.json', 'w') as fh:
+        json.dump(results, fh, indent=2)
+
+
+def create_federate(name, args):
+    fedinfo = h.helicsCreateFederateInfo()
+    h.helicsFederateInfoSetCoreTypeFromString(fedinfo, args.core_type)
+    h.helicsFederateInfoSetCoreInitString(fedinfo, '-f 1')
+    h.helicsFederateInfoSetIntegerProperty(fedinfo,
+                                           h.HELICS_PROPERTY_INT_LOG_LEVEL,
+                                           h.HELICS_LOG_LEVEL_ERROR)
+    return h.helicsCreateValueFederate(name, fedinfo)
+
+
+def enter_executing_mode(fed):
+    start = time.perf_counter()
+    h.helicsFederateEnterExecutingMode(fed)
+    return time.perf_counter() - start
+
+
+def expected_value(num_sources, t, reduction):
+    '''
+    :return: Aggregate of the values published at time t
+    '''
+    if reduction == 'max':
+        return num_sources - 1 + t
+    return num_sources * t + num_sources * (num_sources - 1) / 2
+
+
+def run_source(args):
+    '''
+    Publishes N values every time step for args.steps steps.
+    '''
+    fed = create_federate('agg_source', args)
+    register_start = time.perf_counter()
+    pubs = [h.helicsFederateRegisterGlobalPublication(
+                fed, f'agg_source_{k}', h.HELICS_DATA_TYPE_DOUBLE, '')
+            for k in range(args.num_sources)]
+    register_time = time.perf_counter() - register_start
+    enter_time = enter_executing_mode(fed)
+
+    grant_times = []
+    publish_times = []
+    grantedtime = 0
+    while grantedtime < args.steps:
+        start = time.perf_counter()
+        grantedtime = h.helicsFederateRequestTime(fed, grantedtime + 1)
+        grant_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for k, pub in enumerate(pubs):
+            h.helicsPublicationPublishDouble(pub, k + grantedtime)
+        publish_times.append(time.perf_counter() - start)
+
+    destroy_federate(fed)
+    write_results('source', {'register_time': register_time,
+                             'enter_exec_time': enter_time,
+                             'grant_time': timing_stats(grant_times),
+                             'publish_time': timing_stats(publish_times)})
+
+
+def run_sink(args):
+    '''
+    Aggregates the published values every time step using the layout
+    given by args.mode.
+    '''
+    fed = create_federate('agg_sink', args)
+    register_start = time.perf_counter()
+    if args.mode == 'python':
+        inputs = [h.helicsFederateRegisterSubscription(
+                      fed, f'agg_source_{k}', '')
+                  for k in range(args.num_sources)]
+        reducer = InputReducer(inputs, args.reduction)
+        aggregate = reducer.reduce
+    else:
+        if args.mode == 'vectorize':
+            data_type = h.HELICS_DATA_TYPE_VECTOR
+        else:
+            data_type = h.HELICS_DATA_TYPE_DOUBLE
+        ipt = h.helicsFederateRegisterGlobalInput(fed, 'agg_sink/aggregate',
+                                                  data_type, '')
+        h.helicsInputSetOption(ipt,
+                               h.HELICS_HANDLE_OPTION_MULTI_INPUT_HANDLING_METHOD,
+                               MULTI_INPUT_METHODS[args.mode])
+        for k in range(args.num_sources):
+            h.helicsInputAddTarget(ipt, f'agg_source_{k}')
+        if args.mode == 'vectorize':
+            aggregate = lambda: reduce_vectorized_input(ipt, args.reduction)
+        else:
+            aggregate = lambda: h.helicsInputGetDouble(ipt)
+    register_time = time.perf_counter() - register_start
+    enter_time = enter_executing_mode(fed)
+
+    # One extra step so the values published on the last step are read
+    end_time = args.steps + 1
+    grant_times = []
+    aggregate_times = []
+    value = None
+    grantedtime = 0
+    while grantedtime < end_time:
+        start = time.perf_counter()
+        grantedtime = h.helicsFederateRequestTime(fed, grantedtime + 1)
+        grant_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        value = aggregate()
+        aggregate_times.append(time.perf_counter() - start)
+
+    expected = expected_value(args.num_sources, args.steps, args.reduction)
+    correct = value is not None and abs(value - expected) <= 1e-9 * abs(expected)
+    if not correct:
+        logger.warning(f'Aggregate {value} does not match expected {expected}')
+    destroy_federate(fed)
+    write_results('sink', {'register_time': register_time,
+                           'enter_exec_time': enter_time,
+                           'grant_time': timing_stats(grant_times),
+                           'aggregate_time': timing_stats(aggregate_times),
+                           'value': value,
+                           'expected': expected,
+                           'correct': bool(correct)})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Multi-input aggregation benchmark federates')
+    parser.add_argument('role', choices=['source', 'sink'])
+    parser.add_argument('-m', '--mode',
+                        choices=['sum', 'max', 'vectorize', 'python'],
+                        default='sum')
+    parser.add_argument('-n', '--num_sources', type=int, default=5)
+    parser.add_argument('-s', '--steps', type=int, default=10)
+    parser.add_argument('-r', '--reduction', choices=['sum', 'max'],
+                        default='sum',
+                        help='Reduction used by the vectorize and python'
+                             ' modes')
+    parser.add_argument('--core_type', default='zmq')
+    args = parser.parse_args()
+    if args.mode in ('sum', 'max'):
+        args.reduction = args.mode
+
+    if args.role == 'source':
+        run_source(args)
+    else:
+        run_sink(args)
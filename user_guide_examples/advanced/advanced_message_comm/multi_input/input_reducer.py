@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Python-side alternative to HELICS multi-source inputs. Rather than
+subscribing one input to many publications and letting HELICS aggregate
+them ("multi_input_handling_method" in the config), a federate can
+subscribe to each publication separately and reduce the values itself.
+InputReducer keeps the latest value of every input in a preallocated numpy
+array, only reads the inputs HELICS reports as updated and reduces the
+array in a single numpy call:
+
+    reducer = InputReducer(inputs, 'sum')
+    ...
+    grantedtime = h.helicsFederateRequestTime(fed, requested_time)
+    total = reducer.reduce()
+
+Keeping the individual values means they are still available
+(reducer.values) when the aggregate is not enough, e.g. to find which
+source is responsible for a peak, and the reduction can be changed without
+reconfiguring the federation.
+
+reduce_vectorized_input() does the same reduction for a multi-source input
+using the "vectorize" method, where HELICS gathers all of the values into
+a single vector.
+
+aggregation_benchmark.py compares the two approaches.
+"""
+
+import helics as h
+import numpy as np
+
+REDUCTIONS = {'sum': np.sum,
+              'max': np.max,
+              'min': np.min,
+              'average': np.mean}
+
+
+def _reduction(method):
+    if method not in REDUCTIONS:
+        raise ValueError(f'Unknown reduction method "{method}"; expected one'
+                         f' of {", ".join(REDUCTIONS)}')
+    return REDUCTIONS[method]
+
+
+class InputReducer:
+    '''
+    :param inputs: Sequence of HELICS input objects, each subscribed to a
+        single source
+    :param method: Reduction applied by reduce(); one of REDUCTIONS
+    :param default: Value used for inputs that have not received a value
+    '''
+
+    def __init__(self, inputs, method='sum', default=0.0):
+        self.inputs = list(inputs)
+        self.method = method
+        self._reduce = _reduction(method)
+        self.values = np.full(len(self.inputs), default, dtype=float)
+
+    def update(self):
+        '''
+        Reads the inputs that have been updated since the last call.
+
+        :return: Array with the latest value of every input
+        '''
+        values = self.values
+        for i, ipt in enumerate(self.inputs):
+            if h.helicsInputIsUpdated(ipt):
+                values[i] = h.helicsInputGetDouble(ipt)
+        return values
+
+    def reduce(self):
+        '''
+        :return: Reduction of the latest values of all inputs (float)
+        '''
+        return float(self._reduce(self.update()))
+
+    def __len__(self):
+        return len(self.inputs)
+
+
+def reduce_vectorized_input(ipt, method='sum'):
+    '''
+    Reduces the value of a multi-source input that uses the "vectorize"
+    handling method.
+
+    :param ipt: HELICS input object
+    :param method: One of REDUCTIONS
+    :return: Reduction of all of the values gathered by the input (float)
+    '''
+    values = np.asarray(h.helicsInputGetVector(ipt))
+    if values.size == 0:
+        return 0.0
+    return float(_reduction(method)(values))
@@ -79,9 +79,19 @@ if __name__ == "__main__":
 	logger.debug(f'Number of inputs: {sub_count}')
 	subid = {}
 	sub_name = {}
+	# The input index doubles as the integer ID of each EV. The name of the
+	#	endpoint the control signal goes back to is worked out once here
+	#	rather than by splitting the input name every time step.
+	#	Using a naming convention for this example, define the string that
+	#	is the name of the endpoint that is the original source of this
+	#	information.
+	#	sub_name = Controller/EV1.soc
+	#	endpoint to send message to: Charger/EV1.soc
+	target = []
 	for i in range(0, sub_count):
 		subid[i] = h.helicsFederateGetInputByIndex(fed, i)
 		sub_name[i] = h.helicsInputGetName(subid[i])
+		target.append('Charger/' + sub_name[i].split('/')[1])
 		logger.debug(f'\tRegistered input---> {sub_name[i]}')
 	
 	translator_count = h.helicsFederateGetTranslatorCount(fed)
@@ -138,11 +148,19 @@ if __name__ == "__main__":
 	logger.debug(f'Granted time {grantedtime}')
 
 
-	time_sim = []
-	soc = {}
+	# SOC history preallocated for one row per period (doubled if the
+	#	federate ends up being granted more times than that) and one column
+	#	per EV ID.
+	step = 0
+	soc = np.zeros((total_interval // 300 + 1, sub_count))
+	time_sim = np.zeros(len(soc))
 
 	while grantedtime < total_interval:
 
+		if step == len(soc):
+			soc = np.concatenate((soc, np.zeros_like(soc)))
+			time_sim = np.concatenate((time_sim, np.zeros_like(time_sim)))
+
 		# In HELICS, when multiple messages arrive at an endpoint they
 		# queue up and are popped off one-by-one with the
 		#	"helicsEndpointHasMessage" API call. When that API doesn't
@@ -154,13 +172,7 @@ if __name__ == "__main__":
 			currentsoc = h.helicsInputGetDouble((subid[j]))
 			logger.debug(f'\tReceived SOC {currentsoc:.2f} from input {sub_name[j]}')
 
-			# Using a naming convention for this example, define the string that
-			#	is the name of the endpoint that is the original source of this
-			#	information.
-			#	sub_name = Controller/EV1.soc
-			#	endpoint to send message to: Charger/EV1.soc
-			name_list = sub_name[j].split('/')
-			source = 'Charger/' + name_list[1]
+			source = target[j]
 			logger.debug(f'\tMessage target endpoint: {source}')
 
 			# Send back charging command based on current SOC
@@ -179,15 +191,10 @@ if __name__ == "__main__":
 						 f' with payload {instructions}')
 
 			# Store SOC for later analysis/graphing
-			if source not in soc:
-				soc[source] = []
-			soc[source].append(float(currentsoc))
-			
-			if len(time_sim) > 0:
-				if time_sim[-1] != grantedtime:
-					time_sim.append(grantedtime)
-			else:
-				time_sim.append(grantedtime)
+			soc[step, j] = currentsoc
+
+		time_sim[step] = grantedtime
+		step += 1
 
 		# Since we've dealt with all the messages that are queued, there's
 		#	nothing else for the federate to do until/unless another
@@ -207,10 +214,10 @@ if __name__ == "__main__":
 
 	
 	# Printing out final results graphs for comparison/diagnostic purposes.
-	xaxis = np.array(time_sim)/3600
+	xaxis = time_sim[:step]/3600
 	y = []
-	for key in soc:
-		y.append(np.array(soc[key]))
+	for j in range(0, sub_count):
+		y.append(soc[:step, j])
 
 	if len(y) > 0:
 		fig, axs = plt.subplots(5, sharex=True, sharey=True)
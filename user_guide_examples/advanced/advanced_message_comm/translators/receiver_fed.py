@@ -14,6 +14,8 @@ import numpy as np
 import json
 import pprint 
 import argparse
+import time
+import binary_translator
 
 sim_max_time = 11 # To make sure the last message is receeived
 
@@ -55,7 +57,28 @@ if __name__ == "__main__":
                         help="flag to only create a graph of the historic data"
                                 "(no data collection)",
                         action=argparse.BooleanOptionalAction)
+    parser.add_argument('-t', '--translator_type',
+                        help="json (default) or binary translator",
+                        choices=['json', 'binary'],
+                        default='json')
+    parser.add_argument('-n', '--num_translators',
+                        help="number of translators (one per sender"
+                             " publication)",
+                        type=int,
+                        default=1)
+    parser.add_argument('-s', '--sim_max_time',
+                        type=int,
+                        default=sim_max_time)
+    parser.add_argument('-r', '--results_file',
+                        help="write message count and timing to this JSON"
+                             " file",
+                        default=None)
+    parser.add_argument('-l', '--log_level',
+                        default='DEBUG',
+                        help='Logging level; per-message debug logging'
+                             ' dominates run time at high message rates')
     args = parser.parse_args()
+    logger.setLevel(args.log_level)
     
     if args.max_time:
         logger.debug("max_time flag set")
@@ -73,14 +96,23 @@ if __name__ == "__main__":
     # sub = receiverFed.register_subscription("value_out_1", "double")
 
     #Add the translator(s)
-    translator = h.helicsFederateRegisterGlobalTranslator(receiverFed, h.HELICS_TRANSLATOR_TYPE_JSON, "translator")
+    if args.translator_type == 'binary':
+        translator_type = h.HELICS_TRANSLATOR_TYPE_BINARY
+    else:
+        translator_type = h.HELICS_TRANSLATOR_TYPE_JSON
+    translators = []
+    for i in range(args.num_translators):
+        translators.append(h.helicsFederateRegisterGlobalTranslator(
+            receiverFed, translator_type,
+            "translator" if i == 0 else f"translator_{i + 1}"))
     # Cheating and just copying the hard-coded names from both federates
     # To do this properly you might have to do a query or something similar.
     # As of Feb 1, the APIs to wire in the translator from the translator's
     # viewpoint don't work but from the other end should.
     #h.helicsTranslatorAddSourceTarget(translator, "value_out_1") 
     #h.helicsTranslatorAddDestinationTarget(translator, "endpoint")
-    h.helicsEndpointAddSourceTarget(ep, "translator")
+    for translator in translators:
+        h.helicsEndpointAddSourceTarget(ep, h.helicsTranslatorGetName(translator))
     
     
     receiverFed.enter_executing_mode()
@@ -92,8 +124,14 @@ if __name__ == "__main__":
     logger.info(pprint.pformat(graph))
     
     granted_time = 0
+    received = 0
+    decode_time = 0
+    wall_start = time.perf_counter()
+    # Translated values are decoded into a preallocated array (grown as
+    #   needed) rather than a dict per message.
+    values = np.zeros(64)
     
-    while granted_time < sim_max_time:
+    while granted_time < args.sim_max_time:
         if args.max_time:
             request_time = h.HELICS_TIME_MAXTIME
         else:
@@ -102,12 +140,26 @@ if __name__ == "__main__":
         granted_time = receiverFed.request_time(request_time) # Traditional
         logger.debug(f"Granted time: {granted_time}")
         # logger.debug(f"\tlast published value: {sub.double}")
-        msgDict = {"type": "double", "value": 0}
-        if ep.has_message():
-            msg = ep.get_message()
-            logger.debug(f"\tmessage sent at {msg.time}")
-            logger.debug(f"\ttranslated value: {msg.data}")
-            msgDict = json.loads(msg.data)
+        payloads = []
+        while h.helicsEndpointHasMessage(ep):
+            msg = h.helicsEndpointGetMessage(ep)
+            payloads.append(h.helicsMessageGetBytes(msg))
+            logger.debug(f"\tmessage sent at {h.helicsMessageGetTime(msg)}")
+            logger.debug(f"\ttranslated value: {payloads[-1]}")
+        if len(payloads) > len(values):
+            values = np.zeros(2 * len(payloads))
+        decode_start = time.perf_counter()
+        if args.translator_type == 'binary':
+            step_values = binary_translator.decode_doubles(payloads, values)
+        else:
+            for i, payload in enumerate(payloads):
+                values[i] = json.loads(payload)["value"]
+            step_values = values[:len(payloads)]
+        decode_time += time.perf_counter() - decode_start
+        received += len(payloads)
+        if len(step_values) > 0:
+            logger.debug(f"\treceived {len(step_values)} values,"
+                         f" mean {step_values.mean():.6f}")
 #         out_value = msgDict["value"] - 0.3
 #         jsonStr = f'{{"type": "double", "value": {out_value} }}'
 #         out_msg = ep.create_message()
@@ -116,4 +168,14 @@ if __name__ == "__main__":
 #         ep.send_data(out_msg)
 #         logger.debug(f"\tnew sent message: {jsonStr}\n")
         
-    destroy_federate(receiverFed, args.max_time)
\ No newline at end of file
+    wall_time = time.perf_counter() - wall_start
+    logger.info(f"Received {received} {args.translator_type} translated"
+                f" messages in {wall_time:.3f} s; {decode_time:.3f} s"
+                f" decoding")
+    destroy_federate(receiverFed, args.max_time)
+    if args.results_file:
+        with open(args.results_file, 'w') as fh:
+            json.dump({'translator_type': args.translator_type,
+                       'received': received,
+                       'wall_time': wall_time,
+                       'decode_time': decode_time}, fh, indent=2)
\ No newline at end of file
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Sender and receiver federates used by translator_scaling.py to measure what
+translators cost as their number grows. Both federates run in one of two
+modes:
+
+    translator - the sender publishes K double values, each targeting its
+                 own value->endpoint translator registered by the receiver;
+                 the receiver gets the translated messages on its endpoint
+    direct     - the sender has K targeted endpoints sending the same
+                 doubles (packed as 8 bytes) straight to the receiver
+                 endpoint; the baseline for the translator mode
+
+Every value sent is the sender's time.monotonic() at the moment of sending,
+a system-wide clock on Linux, so the receiver can calculate the wall-clock
+latency of every message. Each federate times entering executing mode and
+each time request and writes its statistics to "results_<role>.json" in the
+working directory.
+"""
+
+import argparse
+import json
+import logging
+import struct
+import time
+
+import helics as h
+import numpy as np
+
+import binary_translator
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+DOUBLE = struct.Struct('<d')
+
+
+def destroy_federate(fed):
+    '''
+    As part of ending a HELICS co-simulation it is good housekeeping to
+    formally destroy a federate. Doing so informs the rest of the
+    federation that it is no longer a part of the co-simulation and they
+    should proceed without it (if applicable).
+
+    :param fed: Federate to be destroyed
+    :return: (none)
+    '''
+    status = h.helicsFederateDisconnect(fed)
+    h.helicsFederateDestroy(fed)
+    logger.info('Federate finalized')
+
+
+def timing_stats(samples):
+    '''
+    :param samples: List of durations (seconds)
+    :return: Dictionary of summary statistics
+    '''
+    if not samples:
+        return {'count': 0}
+    samples = np.array(samples)
+    return {'count': int(samples.size),
+            'mean': float(samples.mean()),
+            'p50': float(np.percentile(samples, 50)),
+            'p95': float(np.percentile(samples, 95)),
+            'max': float(samples.max())}
+
+
+def write_results(role, results):
+    with open(f'results_{role}.json', 'w') as fh:
+        json.dump(results, fh, indent=2)
+
+
+def create_federate(name, args):
+    fedinfo = h.helicsCreateFederateInfo()
+    h.helicsFederateInfoSetCoreTypeFromString(fedinfo, args.core_type)
+    h.helicsFederateInfoSetCoreInitString(fedinfo, '-f 1')
+    h.helicsFederateInfoSetIntegerProperty(fedinfo,
+                                           h.HELICS_PROPERTY_INT_LOG_LEVEL,
+                                           h.HELICS_LOG_LEVEL_ERROR)
+    return h.helicsCreateCombinationFederate(name, fedinfo)
+
+
+def enter_executing_mode(fed):
+    start = time.perf_counter()
+    h.helicsFederateEnterExecutingMode(fed)
+    return time.perf_counter() - start
+
+
+def run_sender(args):
+    '''
+    Sends K values every time step for args.steps steps.
+    '''
+    fed = create_federate('scaling_sender', args)
+    register_start = time.perf_counter()
+    if args.mode == 'translator':
+        pubs = []
+        for k in range(args.num_translators):
+            pub = h.helicsFederateRegisterGlobalPublication(
+                fed, f'scaling_value_{k}', h.HELICS_DATA_TYPE_DOUBLE, '')
+            h.helicsPublicationAddTarget(pub, f'scaling_translator_{k}')
+            pubs.append(pub)
+    else:
+        endpoints = []
+        for k in range(args.num_translators):
+            endid = h.helicsFederateRegisterGlobalTargetedEndpoint(
+                fed, f'scaling_source_{k}', '')
+            h.helicsEndpointAddDestinationTarget(endid, 'scaling_receiver')
+            endpoints.append(endid)
+    register_time = time.perf_counter() - register_start
+    enter_time = enter_executing_mode(fed)
+
+    grant_times = []
+    send_times = []
+    grantedtime = 0
+    while grantedtime < args.steps:
+        start = time.perf_counter()
+        grantedtime = h.helicsFederateRequestTime(fed, grantedtime + 1)
+        grant_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        if args.mode == 'translator':
+            for pub in pubs:
+                h.helicsPublicationPublishDouble(pub, time.monotonic())
+        else:
+            for endid in endpoints:
+                h.helicsEndpointSendBytes(endid,
+                                          DOUBLE.pack(time.monotonic()))
+        send_times.append(time.perf_counter() - start)
+
+    destroy_federate(fed)
+    write_results('sender', {'register_time': register_time,
+                             'enter_exec_time': enter_time,
+                             'grant_time': timing_stats(grant_times),
+                             'send_time': timing_stats(send_times),
+                             'sent': args.num_translators * args.steps})
+
+
+def run_receiver(args):
+    '''
+    Receives and decodes the messages and records their latency. The
+    receiver is event driven; it requests the end of the run and is
+    granted an earlier time whenever messages arrive.
+    '''
+    fed = create_federate('scaling_receiver_fed', args)
+    register_start = time.perf_counter()
+    endid = h.helicsFederateRegisterGlobalTargetedEndpoint(
+        fed, 'scaling_receiver', '')
+    if args.mode == 'translator':
+        if args.translator_type == 'binary':
+            translator_type = h.HELICS_TRANSLATOR_TYPE_BINARY
+        else:
+            translator_type = h.HELICS_TRANSLATOR_TYPE_JSON
+        for k in range(args.num_translators):
+            h.helicsFederateRegisterGlobalTranslator(
+                fed, translator_type, f'scaling_translator_{k}')
+            h.helicsEndpointAddSourceTarget(endid, f'scaling_translator_{k}')
+    register_time = time.perf_counter() - register_start
+    enter_time = enter_executing_mode(fed)
+
+    if args.mode == 'direct':
+        decode = lambda payload: DOUBLE.unpack(payload)[0]
+    elif args.translator_type == 'binary':
+        decode = binary_translator.decode
+    else:
+        decode = lambda payload: json.loads(payload)['value']
+
+    end_time = args.steps + 1
+    grant_times = []
+    latency = []
+    grantedtime = 0
+    while grantedtime < end_time:
+        start = time.perf_counter()
+        grantedtime = h.helicsFederateRequestTime(fed, end_time)
+        grant_times.append(time.perf_counter() - start)
+        while h.helicsEndpointHasMessage(endid):
+            msg = h.helicsEndpointGetMessage(endid)
+            sent = decode(h.helicsMessageGetBytes(msg))
+            latency.append(time.monotonic() - sent)
+
+    destroy_federate(fed)
+    write_results('receiver', {'register_time': register_time,
+                               'enter_exec_time': enter_time,
+                               'grant_time': timing_stats(grant_times),
+                               'received': len(latency),
+                               'latency': timing_stats(latency)})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Translator scaling benchmark federates')
+    parser.add_argument('role', choices=['sender', 'receiver'])
+    parser.add_argument('-m', '--mode', choices=['translator', 'direct'],
+                        default='translator')
+    parser.add_argument('-k', '--num_translators', type=int, default=1)
+    parser.add_argument('-s', '--steps', type=int, default=10)
+    parser.add_argument('-t', '--translator_type',
+                        choices=['json', 'binary'], default='json')
+    parser.add_argument('--core_type', default='zmq')
+    args = parser.parse_args()
+
+    if args.role == 'sender':
+        run_sender(args)
+    else:
+        run_receiver(args)
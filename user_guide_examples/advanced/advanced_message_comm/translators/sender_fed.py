@@ -57,7 +57,20 @@ if __name__ == "__main__":
                         help="flag to only create a graph of the historic data"
                                 "(no data collection)",
                         action=argparse.BooleanOptionalAction)
+    parser.add_argument('-n', '--num_pubs',
+                        help="number of publications, each sent through its"
+                             " own translator, every time step",
+                        type=int,
+                        default=1)
+    parser.add_argument('-s', '--sim_max_time',
+                        type=int,
+                        default=sim_max_time)
+    parser.add_argument('-l', '--log_level',
+                        default='DEBUG',
+                        help='Logging level; per-value debug logging'
+                             ' dominates run time at high message rates')
     args = parser.parse_args()
+    logger.setLevel(args.log_level)
     
     if args.max_time:
         logger.debug("max_time flag set")
@@ -67,9 +80,15 @@ if __name__ == "__main__":
     fedinfo.core_init = "-f 1"
     fedinfo.property[h.HELICS_PROPERTY_INT_LOG_LEVEL] = h.HELICS_LOG_LEVEL_ERROR
     senderFed = h.helicsCreateValueFederate("senderFed", fedinfo)
-    pub = h.helicsFederateRegisterGlobalPublication(senderFed, "value_out_1", h.HELICS_DATA_TYPE_DOUBLE)
-    #sub = senderFed.register_subscription("translator", "double")
-    h.helicsPublicationAddTarget(pub, "translator")
+    # A translator only handles a single source publication (with HELICS
+    #   3.6 several publications targeting the same translator hang the
+    #   federation) so each additional publication gets its own translator.
+    pubs = []
+    for i in range(args.num_pubs):
+        pub = h.helicsFederateRegisterGlobalPublication(senderFed, f"value_out_{i + 1}", h.HELICS_DATA_TYPE_DOUBLE)
+        #sub = senderFed.register_subscription("translator", "double")
+        h.helicsPublicationAddTarget(pub, "translator" if i == 0 else f"translator_{i + 1}")
+        pubs.append(pub)
     senderFed.enter_executing_mode()
     logger.info('Entered HELICS execution mode')
     
@@ -81,12 +100,14 @@ if __name__ == "__main__":
     
     granted_time = 0
     
-    while granted_time < sim_max_time:
+    while granted_time < args.sim_max_time:
         granted_time = senderFed.request_time(granted_time + 1)
         logger.debug(f"Granted time: {granted_time}")
         out_value = granted_time + 0.314159
-        senderFed.get_publication_by_name("value_out_1").publish(out_value)
-        logger.debug(f"\tpublished value {out_value} as a double")
+        for i, pub in enumerate(pubs):
+            h.helicsPublicationPublishDouble(pub, out_value + i)
+        logger.debug(f"\tpublished value {out_value} as a double"
+                     f" on {len(pubs)} publication(s)")
         #logger.debug(f"\treceived value {sub.double}")
         
     destroy_federate(senderFed, args.max_time)
\ No newline at end of file
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Benchmark comparing the JSON and binary translators at high message rates,
+using the sender_fed.py/receiver_fed.py test federation as the harness. For
+every combination of translator type and number of publications, the
+sender publishes a double on every publication each time step, each
+publication passes through its own translator and the receiver drains and
+decodes all of the resulting messages (json.loads() per message for the
+JSON translator, one vectorized numpy read per time step for the binary
+translator; see binary_translator.py).
+
+The receiver reports the number of messages received, its wall-clock time
+in the time loop and the time spent decoding. Results are written to
+"translator_benchmark_results.csv" in the output directory.
+
+    python translator_benchmark.py --num_pubs 1 100 1000 --steps 100
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+TRANSLATOR_TYPES = ['json', 'binary']
+
+script_path = os.path.dirname(os.path.realpath(__file__))
+
+
+def write_json(path, data):
+    with open(path, 'w') as fh:
+        json.dump(data, fh, indent=2)
+
+
+def build_case(case_dir, translator_type, num_pubs, steps):
+    '''
+    Writes the runner file for a single benchmark case.
+
+    :return: Tuple of the path to the runner file and receiver results
+    '''
+    os.makedirs(case_dir, exist_ok=True)
+    results_path = os.path.join(case_dir, 'results_receiver.json')
+    if os.path.exists(results_path):
+        os.remove(results_path)
+    runner = {
+        'name': f'translator_benchmark_{translator_type}_{num_pubs}',
+        'broker': True,
+        'federates': [
+            {'directory': script_path,
+             'exec': f'python -u sender_fed.py -n {num_pubs} -s {steps}'
+                     f' -l WARNING',
+             'host': 'localhost',
+             'name': 'sender'},
+            # One extra step so the last message sent is received
+            {'directory': script_path,
+             'exec': f'python -u receiver_fed.py -t {translator_type}'
+                     f' -n {num_pubs} -s {steps + 1} -r {results_path}'
+                     f' -l WARNING',
+             'host': 'localhost',
+             'name': 'receiver'}
+        ]
+    }
+    runner_path = os.path.join(case_dir, 'runner.json')
+    write_json(runner_path, runner)
+    return runner_path, results_path
+
+
+def run_case(case_dir, translator_type, num_pubs, steps):
+    '''
+    Runs a single benchmark case and collects the results.
+
+    :return: Dictionary with one row of benchmark results
+    '''
+    runner_path, results_path = build_case(case_dir, translator_type,
+                                           num_pubs, steps)
+    logger.info(f'Running {translator_type} translator with {num_pubs}'
+                f' publications for {steps} steps')
+    wall_start = time.perf_counter()
+    status = subprocess.call(f'helics run --path={runner_path}', shell=True)
+    run_time = time.perf_counter() - wall_start
+
+    results = {}
+    if os.path.exists(results_path):
+        with open(results_path) as fh:
+            results = json.load(fh)
+    else:
+        logger.warning(f'No receiver results found in {case_dir}')
+    received = results.get('received', 0)
+    wall_time = results.get('wall_time')
+    decode_time = results.get('decode_time')
+    return {'translator_type': translator_type,
+            'num_pubs': num_pubs,
+            'steps': steps,
+            'status': status,
+            'run_time': run_time,
+            'expected': num_pubs * steps,
+            'received': received,
+            'receiver_wall_time': wall_time,
+            'decode_time': decode_time,
+            'decode_us_per_msg': 1e6 * decode_time / received
+                if received else None,
+            'msgs_per_s': received / wall_time if wall_time else None}
+
+
+def main(args):
+    rows = []
+    for num_pubs in args.num_pubs:
+        for translator_type in args.translator_types:
+            case_dir = os.path.join(os.path.realpath(args.out_dir),
+                                    f'{translator_type}_{num_pubs}')
+            rows.append(run_case(case_dir, translator_type, num_pubs,
+                                 args.steps))
+    df = pd.DataFrame(rows)
+    results_path = os.path.join(args.out_dir,
+                                'translator_benchmark_results.csv')
+    df.to_csv(results_path, index=False)
+    logger.info(f'\n{df.to_string(index=False)}')
+    logger.info(f'Results written to {results_path}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare JSON and binary translator throughput')
+    parser.add_argument('-n', '--num_pubs', nargs='+', type=int,
+                        default=[1, 100, 1000])
+    parser.add_argument('-s', '--steps', type=int, default=100,
+                        help='Number of time steps the sender publishes')
+    parser.add_argument('-t', '--translator_types', nargs='+',
+                        choices=TRANSLATOR_TYPES, default=TRANSLATOR_TYPES)
+    parser.add_argument('-o', '--out_dir',
+                        default=os.path.join(script_path, 'runs'))
+    args = parser.parse_args()
+    os.makedirs(args.out_dir, exist_ok=True)
+    main(args)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Scaling benchmark for HELICS translators. For every K in --num_translators
+a two-federate federation (scaling_federates.py) is generated and run
+twice: once with K value->endpoint translators bridging the sender's
+publications to the receiver's endpoint, and once with K sender endpoints
+messaging the receiver directly as the baseline. The results show how
+entering executing mode, the per-step time grants and the message latency
+grow with the number of translators compared with plain endpoint
+messaging, which is what matters when using translators to bridge
+value-only power system models to message-based controllers.
+
+Results are written to "translator_scaling_results.csv" in the output
+directory.
+
+    python translator_scaling.py --num_translators 1 10 100 1000 10000
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+MODES = ['translator', 'direct']
+
+script_path = os.path.dirname(os.path.realpath(__file__))
+
+
+def write_json(path, data):
+    with open(path, 'w') as fh:
+        json.dump(data, fh, indent=2)
+
+
+def read_results(case_dir, role):
+    path = os.path.join(case_dir, f'results_{role}.json')
+    if not os.path.exists(path):
+        logger.warning(f'No results found for {role} in {case_dir}')
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def build_case(case_dir, mode, num_translators, steps, translator_type):
+    '''
+    Writes the runner file for a single benchmark case.
+
+    :return: Path to the runner file
+    '''
+    os.makedirs(case_dir, exist_ok=True)
+    for role in ('sender', 'receiver'):
+        path = os.path.join(case_dir, f'results_{role}.json')
+        if os.path.exists(path):
+            os.remove(path)
+    feds = os.path.join(script_path, 'scaling_federates.py')
+    common = f'-m {mode} -k {num_translators} -s {steps} -t {translator_type}'
+    runner = {
+        'name': f'translator_scaling_{mode}_{num_translators}',
+        'broker': True,
+        'federates': [
+            {'directory': case_dir,
+             'exec': f'python -u {feds} sender {common}',
+             'host': 'localhost',
+             'name': 'sender'},
+            {'directory': case_dir,
+             'exec': f'python -u {feds} receiver {common}',
+             'host': 'localhost',
+             'name': 'receiver'}
+        ]
+    }
+    runner_path = os.path.join(case_dir, 'runner.json')
+    write_json(runner_path, runner)
+    return runner_path
+
+
+def run_case(case_dir, mode, num_translators, steps, translator_type):
+    '''
+    Runs a single benchmark case and collects the results.
+
+    :return: Dictionary with one row of benchmark results
+    '''
+    runner_path = build_case(case_dir, mode, num_translators, steps,
+                             translator_type)
+    logger.info(f'Running {mode} with K={num_translators} for {steps} steps')
+    wall_start = time.perf_counter()
+    status = subprocess.call(f'helics run --path={runner_path}', shell=True)
+    run_time = time.perf_counter() - wall_start
+
+    sender = read_results(case_dir, 'sender')
+    receiver = read_results(case_dir, 'receiver')
+    return {'mode': mode,
+            'num_translators': num_translators,
+            'steps': steps,
+            'status': status,
+            'run_time': run_time,
+            'sender_register_time': sender.get('register_time'),
+            'receiver_register_time': receiver.get('register_time'),
+            'sender_enter_exec_time': sender.get('enter_exec_time'),
+            'receiver_enter_exec_time': receiver.get('enter_exec_time'),
+            'grant_time_mean': sender.get('grant_time', {}).get('mean'),
+            'grant_time_p95': sender.get('grant_time', {}).get('p95'),
+            'sent': sender.get('sent'),
+            'received': receiver.get('received'),
+            'latency_mean': receiver.get('latency', {}).get('mean'),
+            'latency_p95': receiver.get('latency', {}).get('p95')}
+
+
+def main(args):
+    rows = []
+    for num_translators in args.num_translators:
+        for mode in args.modes:
+            case_dir = os.path.join(os.path.realpath(args.out_dir),
+                                    f'{mode}_{num_translators}')
+            rows.append(run_case(case_dir, mode, num_translators, args.steps,
+                                 args.translator_type))
+    df = pd.DataFrame(rows)
+    results_path = os.path.join(args.out_dir,
+                                'translator_scaling_results.csv')
+    df.to_csv(results_path, index=False)
+    logger.info(f'\n{df.to_string(index=False)}')
+    logger.info(f'Results written to {results_path}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Translator vs direct endpoint scaling benchmark')
+    parser.add_argument('-k', '--num_translators', nargs='+', type=int,
+                        default=[1, 10, 100, 1000, 10000])
+    parser.add_argument('-s', '--steps', type=int, default=10,
+                        help='Number of time steps the sender publishes')
+    parser.add_argument('-m', '--modes', nargs='+', choices=MODES,
+                        default=MODES)
+    parser.add_argument('-t', '--translator_type',
+                        choices=['json', 'binary'], default='json')
+    parser.add_argument('-o', '--out_dir',
+                        default=os.path.join(script_path, 'scaling_runs'))
+    args = parser.parse_args()
+    os.makedirs(args.out_dir, exist_ok=True)
+    main(args)
@@ -20,7 +20,9 @@ allison.m.campbell@pnnl.gov, trevor.hardy@pnnl.gov
 import matplotlib.pyplot as plt
 import helics as h
 import logging
+import argparse
 import numpy as np
+import message_codec as codec
 
 
 
@@ -132,10 +134,25 @@ def estimate_SOC(charging_V, charging_A):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='EV charger')
+    parser.add_argument('-c', '--config',
+                        help='federate config file',
+                        default='ChargerConfig.json')
+    parser.add_argument('--codec',
+                        help='encoding of the SOC messages sent to the'
+                             ' controller',
+                        choices=['text', 'binary'],
+                        default='text')
+    args = parser.parse_args()
+    if args.codec == 'binary':
+        encode = codec.encode
+    else:
+        encode = codec.encode_text
+
     np.random.seed(268)
 
     ##############  Registering  federate from json  ##########################
-    fed = h.helicsCreateCombinationFederateFromConfig("ChargerConfig.json")
+    fed = h.helicsCreateCombinationFederateFromConfig(args.config)
     federate_name = h.helicsFederateGetName(fed)
     logger.info(f'Created federate {federate_name}')
     end_count = h.helicsFederateGetEndpointCount(fed)
@@ -253,7 +270,9 @@ if __name__ == "__main__":
             endpoint_name = h.helicsEndpointGetName(endid[j])
             if h.helicsEndpointHasMessage(endid[j]):
                 msg = h.helicsEndpointGetMessage(endid[j])
-                instructions = h.helicsMessageGetString(msg)
+                # Accepts both the binary and legacy text formats
+                instructions = codec.decode(codec.COMMAND,
+                                            h.helicsMessageGetBytes(msg))
                 logger.debug(f'\tReceived message at endpoint {endpoint_name}'
                              f' at time {grantedtime}'
                              f' with command {instructions}')
@@ -264,7 +283,7 @@ if __name__ == "__main__":
                 #       EV Controller sends anything else: stop charging
                 # The default state is charging (1) so we only need to
                 #   do something if the controller says to stop
-                if int(instructions) == 0:
+                if instructions == 0:
                     # Stop charging this EV
                     charging_voltage[j] = 0
                     logger.info(f'\tEV full; removing charging voltage')
@@ -282,12 +301,12 @@ if __name__ == "__main__":
             if grantedtime % 900 == 0:
                 destination_name = str(
                     h.helicsEndpointGetDefaultDestination(endid[j]))
-                message = f'{currentsoc[j]:4f}'
-                h.helicsEndpointSendBytes(endid[j], message.encode())
+                message = encode(codec.SOC, currentsoc[j])
+                h.helicsEndpointSendBytes(endid[j], message)
                 logger.debug(f'Sent message from endpoint {endpoint_name}'
                              f' to destination {destination_name}'
                              f' at time {grantedtime}'
-                             f' with payload SOC {message}')
+                             f' with payload SOC {currentsoc[j]:4f}')
 
         # Calculate the total power required by all chargers. This is the
         #   primary metric of interest, to understand the power profile
@@ -14,7 +14,11 @@ allison.m.campbell@pnnl.gov
 import matplotlib.pyplot as plt
 import helics as h
 import logging
+import argparse
+import json
 import numpy as np
+import message_codec as codec
+from name_table import NameTable
 import sys
 import time
 
@@ -45,9 +49,60 @@ def destroy_federate(fed):
     logger.info('Federate finalized')
 
 
+def write_summary(path, federate_name, end_name, time_sim, sources_table,
+                  soc, soc_full=0.95):
+    '''
+    Writes a JSON summary of the EVs this controller handled. When the
+    controller is sharded (see shard_controller_configs.py) each shard
+    writes its own summary and aggregate_shards.py combines them.
+
+    :param path: Path of the summary file
+    :param federate_name: Name of this controller federate
+    :param end_name: Name of the controller endpoint
+    :param time_sim: List of times the controller was granted
+    :param sources_table: NameTable of the EV endpoints
+    :param soc: List (indexed by EV ID) of SOC histories
+    :param soc_full: SOC above which EVs are told to stop charging
+    :return: (none)
+    '''
+    evs = {}
+    for source_id, history in enumerate(soc):
+        evs[sources_table.name(source_id)] = {
+            'messages': len(history),
+            'final_soc': float(history[-1]),
+            'mean_soc': float(np.mean(history)),
+            'charging': bool(history[-1] <= soc_full)}
+    summary = {'federate': federate_name,
+               'endpoint': end_name,
+               'grants': len(time_sim),
+               'messages': sum(ev['messages'] for ev in evs.values()),
+               'evs': evs}
+    with open(path, 'w') as fh:
+        json.dump(summary, fh, indent=2)
+    logger.info(f'Wrote summary of {len(evs)} EVs to {path}')
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='EV charge controller')
+    parser.add_argument('-c', '--config',
+                        help='federate config file',
+                        default='ControllerConfig.json')
+    parser.add_argument('-s', '--summary_file',
+                        help='write a JSON summary of the EVs handled by'
+                             ' this controller to this file',
+                        default=None)
+    parser.add_argument('-p', '--plot',
+                        help='graph the SOC of each charging port',
+                        action=argparse.BooleanOptionalAction,
+                        default=True)
+    parser.add_argument('-b', '--batch',
+                        help='handle all queued SOC messages as one batch'
+                             ' each time step',
+                        action='store_true')
+    args = parser.parse_args()
+
     ##############  Registering  federate from json  ##########################
-    fed = h.helicsCreateMessageFederateFromConfig("ControllerConfig.json")
+    fed = h.helicsCreateMessageFederateFromConfig(args.config)
     federate_name = h.helicsFederateGetName(fed)
     logger.info(f'Created federate {federate_name}')
 
@@ -86,43 +141,90 @@ if __name__ == "__main__":
 
 
     time_sim = []
-    soc = {}
+    # SOC history per source endpoint, indexed by the source's interned ID
+    #   rather than keyed by the endpoint name
+    sources_table = NameTable()
+    soc = []
+    # Batch mode: SOC of every source (column, by its ID in sources_table)
+    #   at every grant (row), preallocated and doubled when it is full
+    soc_table = np.full((96, 8), np.nan)
+    # Charging commands, pre-encoded and indexed by the decision
+    text_replies = (b'0', b'1')
+    binary_replies = (codec.encode(codec.COMMAND, 0),
+                      codec.encode(codec.COMMAND, 1))
 
     while grantedtime < total_interval:
 
-        # In HELICS, when multiple messages arrive at an endpoint they
-        # queue up and are popped off one-by-one with the
-        #   "helicsEndpointHasMessage" API call. When that API doesn't
-        #   return a message, you've processed them all.
-        while h.helicsEndpointHasMessage(endid):
-
-            # Get the SOC from the EV/charging terminal in question
-            msg = h.helicsEndpointGetMessage(endid)
-            currentsoc = h.helicsMessageGetString(msg)
-            source = h.helicsMessageGetOriginalSource(msg)
-            logger.debug(f'\tReceived message from endpoint {source}'
-                         f' at time {grantedtime}'
-                         f' with SOC {currentsoc}')
-
-            # Send back charging command based on current SOC
-            #   Our very basic protocol:
-            #       If the SOC is less than soc_full keep charging (send "1")
-            #       Otherwise, stop charging (send "0")
-            soc_full = 0.95
-            if float(currentsoc) <= soc_full:
-                instructions = 1
-            else:
-                instructions = 0
-            message = str(instructions)
-            h.helicsEndpointSendBytesTo(endid, message.encode(), source)
-            logger.debug(f'\tSent message to endpoint {source}'
-                         f' at time {grantedtime}'
-                         f' with payload {instructions}')
-
-            # Store SOC for later analysis/graphing
-            if source not in soc:
-                soc[source] = []
-            soc[source].append(float(currentsoc))
+        if args.batch:
+            # Pull every queued SOC message off the endpoint, decide all of
+            #   the charging instructions with one comparison and store the
+            #   SOCs with one assignment into this grant's row of soc_table
+            msgs = []
+            while h.helicsEndpointHasMessage(endid):
+                msgs.append(h.helicsEndpointGetMessage(endid))
+            sources = [h.helicsMessageGetOriginalSource(m) for m in msgs]
+            payloads = [h.helicsMessageGetBytes(m) for m in msgs]
+            socs = np.array([codec.decode(codec.SOC, p) for p in payloads],
+                            dtype=float)
+            ids = [sources_table.intern(s) for s in sources]
+            row = len(time_sim)
+            # Double the table when it runs out of rows (grants) or
+            #   columns (sources), so it is only reallocated a few times
+            if row == soc_table.shape[0]:
+                soc_table = np.vstack([soc_table,
+                                       np.full_like(soc_table, np.nan)])
+            if len(sources_table) > soc_table.shape[1]:
+                extra = max(soc_table.shape[1],
+                            len(sources_table) - soc_table.shape[1])
+                soc_table = np.hstack(
+                    [soc_table, np.full((soc_table.shape[0], extra), np.nan)])
+            soc_table[row, ids] = socs
+            for source, payload, charge in zip(sources, payloads,
+                                               (socs <= 0.95).tolist()):
+                # Replying in the same format as the SOC was sent
+                replies = binary_replies if codec.is_binary(payload) \
+                    else text_replies
+                h.helicsEndpointSendBytesTo(endid, replies[charge], source)
+        else:
+            # In HELICS, when multiple messages arrive at an endpoint they
+            # queue up and are popped off one-by-one with the
+            #   "helicsEndpointHasMessage" API call. When that API doesn't
+            #   return a message, you've processed them all.
+            while h.helicsEndpointHasMessage(endid):
+
+                # Get the SOC from the EV/charging terminal in question
+                msg = h.helicsEndpointGetMessage(endid)
+                payload = h.helicsMessageGetBytes(msg)
+                currentsoc = codec.decode(codec.SOC, payload)
+                source = h.helicsMessageGetOriginalSource(msg)
+                logger.debug(f'\tReceived message from endpoint {source}'
+                             f' at time {grantedtime}'
+                             f' with SOC {currentsoc}')
+
+                # Send back charging command based on current SOC
+                #   Our very basic protocol:
+                #       If the SOC is less than soc_full keep charging (send "1")
+                #       Otherwise, stop charging (send "0")
+                soc_full = 0.95
+                if currentsoc <= soc_full:
+                    instructions = 1
+                else:
+                    instructions = 0
+                # Replying in the same format (binary or text) as the SOC was sent
+                if codec.is_binary(payload):
+                    message = codec.encode(codec.COMMAND, instructions)
+                else:
+                    message = str(instructions).encode()
+                h.helicsEndpointSendBytesTo(endid, message, source)
+                logger.debug(f'\tSent message to endpoint {source}'
+                             f' at time {grantedtime}'
+                             f' with payload {instructions}')
+
+                # Store SOC for later analysis/graphing
+                source_id = sources_table.intern(source)
+                if source_id == len(soc):
+                    soc.append([])
+                soc[source_id].append(currentsoc)
 
         time_sim.append(grantedtime)
 
@@ -137,11 +239,23 @@ if __name__ == "__main__":
     # Close out co-simulation execution cleanly now that we're done.
     destroy_federate(fed)
 
+    if args.batch:
+        # Back to one SOC history per source for the summary and graphs
+        soc = [column[~np.isnan(column)] for column
+               in soc_table[:len(time_sim), :len(sources_table)].T]
+
+    if args.summary_file:
+        write_summary(args.summary_file, federate_name, end_name, time_sim,
+                      sources_table, soc)
+
+    if not args.plot:
+        sys.exit(0)
+
     # Printing out final results graphs for comparison/diagnostic purposes.
     xaxis = np.array(time_sim)/3600
     y = []
-    for key in soc:
-        y.append(np.array(soc[key]))
+    for history in soc:
+        y.append(np.array(history))
 
 
     fig, axs = plt.subplots(5, sharex=True, sharey=True)
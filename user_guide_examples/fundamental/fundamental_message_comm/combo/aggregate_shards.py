@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Combines the per-shard summaries written by the sharded EV charge
+controllers (see shard_controller_configs.py) into a single summary of the
+whole charging garage. Also checks that the shards really did partition the
+chargers: every EV should have been handled by exactly one shard.
+
+    python aggregate_shards.py -o combined_summary.json
+"""
+
+import argparse
+import glob
+import json
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.DEBUG)
+
+
+def aggregate(summaries):
+    '''
+    :param summaries: List of per-shard summary dictionaries
+    :return: Dictionary with the combined summary
+    '''
+    evs = {}
+    overlap = []
+    shards = {}
+    for summary in summaries:
+        shards[summary['federate']] = {'evs': len(summary['evs']),
+                                       'messages': summary['messages'],
+                                       'grants': summary['grants']}
+        for ev, stats in summary['evs'].items():
+            if ev in evs:
+                overlap.append(ev)
+            evs[ev] = dict(stats, shard=summary['federate'])
+
+    final_soc = [ev['final_soc'] for ev in evs.values()]
+    return {'shards': shards,
+            'evs': len(evs),
+            'messages': sum(s['messages'] for s in shards.values()),
+            'charging': sum(ev['charging'] for ev in evs.values()),
+            'mean_final_soc': sum(final_soc) / len(final_soc)
+                if final_soc else None,
+            'overlapping_evs': sorted(set(overlap)),
+            'by_ev': dict(sorted(evs.items()))}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Combine sharded controller summaries')
+    parser.add_argument('summaries', nargs='*',
+                        help='Per-shard summary files (default:'
+                             ' Controller_shard*_summary.json)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='write the combined summary to this file')
+    args = parser.parse_args()
+
+    paths = args.summaries or sorted(glob.glob('Controller_shard*_summary.json'))
+    if not paths:
+        logger.error('No shard summaries found')
+        sys.exit(1)
+    summaries = []
+    for path in paths:
+        with open(path) as fh:
+            summaries.append(json.load(fh))
+    combined = aggregate(summaries)
+
+    for shard, stats in combined['shards'].items():
+        logger.info(f'{shard}: {stats["evs"]} EVs, {stats["messages"]}'
+                    f' messages, {stats["grants"]} grants')
+    logger.info(f'Total: {combined["evs"]} EVs, {combined["messages"]}'
+                f' messages, {combined["charging"]} still charging')
+    if combined['overlapping_evs']:
+        logger.warning(f'EVs handled by more than one shard:'
+                       f' {combined["overlapping_evs"]}')
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(combined, fh, indent=2)
+        logger.info(f'Wrote combined summary to {args.output}')
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Compact, versioned binary encoding for the messages exchanged between the
+Charger and Controller federates. By default these examples send numbers as
+text (the SOC as "0.734512", the charging command as "1") which the
+receiving federate has to parse back with float() or int(). The codecs
+here pack each message type into a fixed struct layout instead:
+
+    byte 0      - marker/version byte (0xC1 for version 1)
+    byte 1      - message kind (SOC, COMMAND, COMPLEX, ...)
+    bytes 2...  - fixed layout payload for that kind
+
+The marker byte can never start a valid UTF-8 string so decode() can tell
+binary messages from the legacy text format and falls back to parsing the
+text. That allows federates using the binary codec to interoperate with
+ones that still send text.
+
+New message kinds can be added with register_codec().
+"""
+
+import struct
+
+VERSION = 1
+MARKER = 0xC0 | VERSION
+
+SOC = 1
+COMMAND = 2
+COMPLEX = 3
+
+_codecs = {}
+
+
+class _Codec:
+    def __init__(self, kind, fmt, to_fields, from_fields, legacy):
+        self.struct = struct.Struct('<BB' + fmt)
+        self.kind = kind
+        self.to_fields = to_fields
+        self.from_fields = from_fields
+        self.legacy = legacy
+
+
+def register_codec(kind, fmt, to_fields, from_fields, legacy):
+    '''
+    Adds a message kind to the codec registry.
+
+    :param kind: Integer ID of the message kind (0-255)
+    :param fmt: struct format (without byte order) of the payload
+    :param to_fields: Function converting a value to a tuple of struct
+        fields
+    :param from_fields: Function converting the unpacked struct fields back
+        to a value
+    :param legacy: Function parsing the legacy text representation
+    '''
+    if kind in _codecs:
+        raise ValueError(f'Message kind {kind} is already registered')
+    _codecs[kind] = _Codec(kind, fmt, to_fields, from_fields, legacy)
+
+
+register_codec(SOC, 'f', lambda soc: (soc,), lambda soc: soc, float)
+register_codec(COMMAND, 'B', lambda cmd: (cmd,), lambda cmd: cmd, int)
+register_codec(COMPLEX, 'dd', lambda c: (c.real, c.imag),
+               lambda real, imag: complex(real, imag), complex)
+
+
+def encode(kind, value):
+    '''
+    :param kind: Message kind (SOC, COMMAND, COMPLEX, ...)
+    :param value: Value to be encoded
+    :return: Encoded message payload (bytes)
+    '''
+    codec = _codecs[kind]
+    return codec.struct.pack(MARKER, kind, *codec.to_fields(value))
+
+
+def encode_text(kind, value):
+    '''
+    Legacy text encoding, matching what the examples have always sent.
+    '''
+    if kind == SOC:
+        return f'{value:4f}'.encode()
+    return str(value).encode()
+
+
+def is_binary(payload):
+    return len(payload) > 0 and payload[0] == MARKER
+
+
+def decode(kind, payload):
+    '''
+    Decodes a message payload in either the binary or legacy text format.
+
+    :param kind: Expected message kind
+    :param payload: Message payload (bytes)
+    :return: Decoded value
+    '''
+    codec = _codecs[kind]
+    if is_binary(payload):
+        marker, payload_kind, *fields = codec.struct.unpack(payload)
+        if payload_kind != kind:
+            raise ValueError(f'Expected message kind {kind},'
+                             f' got {payload_kind}')
+        return codec.from_fields(*fields)
+    return codec.legacy(payload.decode())
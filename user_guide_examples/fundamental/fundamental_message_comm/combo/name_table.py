@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Interning of endpoint and input names to dense integer IDs. Federates that
+handle a message from every charger each time step otherwise spend a
+surprising amount of time hashing (and sometimes splitting) the same few
+name strings over and over. Interning each name once, either when the
+interface is registered or the first time a message from it is seen, lets
+the per-message bookkeeping work on small integers that can directly index
+lists and preallocated numpy arrays.
+
+Both directions of the lookup are O(1):
+
+    table = NameTable()
+    ev_id = table.intern('Charger/EV3.soc')   # -> 0
+    table.name(ev_id)                          # -> 'Charger/EV3.soc'
+"""
+
+
+class NameTable:
+    '''
+    Bidirectional mapping between interface names and dense integer IDs.
+    IDs are handed out in the order the names are first interned starting
+    at zero.
+
+    :param names: Optional iterable of names to intern up front (for
+        example the interfaces read from the federate config)
+    '''
+
+    def __init__(self, names=()):
+        self.ids = {}
+        self.names = []
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name):
+        '''
+        :param name: Interface name
+        :return: Integer ID of the name, assigning a new one on first sight
+        '''
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def id_of(self, name):
+        '''
+        :param name: Interface name
+        :return: Integer ID of the name or None if it was never interned
+        '''
+        return self.ids.get(name)
+
+    def name(self, name_id):
+        return self.names[name_id]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
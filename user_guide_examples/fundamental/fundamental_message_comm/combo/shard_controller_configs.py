@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Launcher/config generator for running the EV charge controller
+(Controller.py) as several sharded federates rather than one. In the
+standard example every charger endpoint sends its SOC to the single
+"Controller/ep" endpoint so one Python process has to handle every message
+in the federation, which becomes the throughput ceiling once there are
+thousands of EVs.
+
+Here each controller shard gets its own federate and endpoint
+("Controller_shard<k>/ep") and owns a fixed subset of the charger endpoints,
+chosen by a stable hash of the charger endpoint name. The charger config is
+rewritten so each charger endpoint's default destination is the shard that
+owns it; replies go back to the message's original source so the charger
+side needs no other changes.
+
+Running
+
+    python shard_controller_configs.py -n 3
+
+writes ControllerConfig_shard0.json ... ControllerConfig_shard2.json,
+ChargerConfig_sharded.json and fundamental_combo_sharded_runner.json which
+can be run with "helics run --path=fundamental_combo_sharded_runner.json".
+Each shard writes a summary of the EVs it handled and
+
+    python aggregate_shards.py
+
+combines them once the co-simulation has finished.
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.DEBUG)
+
+
+def shard_for(endpoint_name, num_shards):
+    '''
+    Stable mapping of an endpoint name to a shard index. Python's built-in
+    hash() is salted per-process so BLAKE2 is used instead; the same
+    endpoint name always lands on the same shard in every process and
+    every run. (CRC32 is not used here as charger names differing only in
+    their EV number tend to share the low bits of their CRC and pile up on
+    the same shard.)
+
+    :param endpoint_name: Name of the charger endpoint
+    :param num_shards: Total number of controller shards
+    :return: Index of the shard owning this endpoint
+    '''
+    digest = hashlib.blake2b(endpoint_name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % num_shards
+
+
+def shard_endpoint(base_endpoint, shard_idx):
+    '''
+    :param base_endpoint: Name of the un-sharded controller endpoint
+        ("Controller/ep")
+    :param shard_idx: Index of the shard
+    :return: Name of the shard's controller endpoint
+    '''
+    fed_name, local_name = base_endpoint.split('/', 1)
+    return f'{fed_name}_shard{shard_idx}/{local_name}'
+
+
+def build_shard_config(base_config, shard_idx):
+    '''
+    Creates the federate configuration for one controller shard from the
+    single controller configuration.
+
+    :param base_config: Dictionary of the un-sharded controller config
+    :param shard_idx: Index of the shard being created
+    :return: Dictionary with the shard's federate config
+    '''
+    config = copy.deepcopy(base_config)
+    config['name'] = f'{base_config["name"]}_shard{shard_idx}'
+    for endpoint in config['endpoints']:
+        endpoint['name'] = shard_endpoint(endpoint['name'], shard_idx)
+    return config
+
+
+def build_charger_config(base_config, controller_endpoint, num_shards):
+    '''
+    Points each charger endpoint that talks to the controller at the shard
+    that owns it.
+
+    :param base_config: Dictionary of the charger federate config
+    :param controller_endpoint: Name of the un-sharded controller endpoint
+    :param num_shards: Total number of controller shards
+    :return: Tuple of the sharded charger config and a list (one entry per
+        shard) of the charger endpoints owned by each shard
+    '''
+    config = copy.deepcopy(base_config)
+    partitions = [[] for _ in range(num_shards)]
+    for endpoint in config['endpoints']:
+        if endpoint.get('destination') != controller_endpoint:
+            continue
+        shard_idx = shard_for(endpoint['name'], num_shards)
+        endpoint['destination'] = shard_endpoint(controller_endpoint,
+                                                 shard_idx)
+        partitions[shard_idx].append(endpoint['name'])
+    return config, partitions
+
+
+def build_runner(base_runner, num_shards, controller_exec='Controller.py',
+                 charger_exec='Charger.py'):
+    '''
+    Creates a runner file with the single controller federate replaced by
+    the controller shards and the charger using the sharded config.
+
+    :param base_runner: Dictionary of the un-sharded runner file
+    :param num_shards: Total number of controller shards
+    :param controller_exec: Name of the controller federate script
+    :param charger_exec: Name of the charger federate script
+    :return: Dictionary with the sharded runner config
+    '''
+    runner = copy.deepcopy(base_runner)
+    runner['name'] = f'{base_runner["name"]}_sharded'
+    federates = []
+    for fed in runner['federates']:
+        if controller_exec in fed['exec']:
+            continue
+        if charger_exec in fed['exec']:
+            fed['exec'] += ' -c ChargerConfig_sharded.json'
+        federates.append(fed)
+    for shard_idx in range(num_shards):
+        federates.append({
+            'directory': '.',
+            'exec': f'python -u {controller_exec}'
+                    f' -c ControllerConfig_shard{shard_idx}.json'
+                    f' -s Controller_shard{shard_idx}_summary.json'
+                    f' --no-plot',
+            'host': 'localhost',
+            'name': f'Controller_shard{shard_idx}'
+        })
+    runner['federates'] = federates
+    return runner
+
+
+def write_shard_configs(num_shards, controller_config_path,
+                        charger_config_path, base_runner_path, out_dir):
+    '''
+    Reads the un-sharded controller and charger configs and runner and
+    writes out the sharded versions.
+
+    :param num_shards: Total number of controller shards
+    :param controller_config_path: Path to un-sharded controller config
+    :param charger_config_path: Path to the charger config
+    :param base_runner_path: Path to un-sharded runner file
+    :param out_dir: Directory where the sharded files are written
+    :return: Path to the generated runner file
+    '''
+    with open(controller_config_path) as fh:
+        controller_config = json.load(fh)
+    with open(charger_config_path) as fh:
+        charger_config = json.load(fh)
+    with open(base_runner_path) as fh:
+        base_runner = json.load(fh)
+
+    controller_endpoint = controller_config['endpoints'][0]['name']
+    charger_config, partitions = build_charger_config(
+        charger_config, controller_endpoint, num_shards)
+    for shard_idx, chargers in enumerate(partitions):
+        if not chargers:
+            logger.warning(f'Shard {shard_idx} owns no chargers; consider'
+                           f' using fewer shards')
+        logger.info(f'Shard {shard_idx} owns {len(chargers)} chargers')
+        logger.debug(f'\t{chargers}')
+        config = build_shard_config(controller_config, shard_idx)
+        path = os.path.join(out_dir, f'ControllerConfig_shard{shard_idx}.json')
+        with open(path, 'w') as fh:
+            json.dump(config, fh, indent=2)
+
+    path = os.path.join(out_dir, 'ChargerConfig_sharded.json')
+    with open(path, 'w') as fh:
+        json.dump(charger_config, fh, indent=2)
+
+    runner = build_runner(base_runner, num_shards)
+    runner_path = os.path.join(out_dir,
+                               'fundamental_combo_sharded_runner.json')
+    with open(runner_path, 'w') as fh:
+        json.dump(runner, fh, indent=2)
+    logger.info(f'Wrote runner file {runner_path}')
+    return runner_path
+
+
+if __name__ == '__main__':
+    script_path = os.path.dirname(os.path.realpath(__file__))
+    parser = argparse.ArgumentParser(
+        description='Generate sharded controller configs')
+    parser.add_argument('-n',
+                        '--num_shards',
+                        type=int,
+                        default=2)
+    parser.add_argument('-c',
+                        '--config',
+                        default=os.path.join(script_path,
+                                             'ControllerConfig.json'))
+    parser.add_argument('--charger_config',
+                        default=os.path.join(script_path,
+                                             'ChargerConfig.json'))
+    parser.add_argument('-r',
+                        '--runner',
+                        default=os.path.join(script_path,
+                                             'fundamental_combo_runner.json'))
+    parser.add_argument('-o',
+                        '--out_dir',
+                        default=script_path)
+    args = parser.parse_args()
+    write_shard_configs(args.num_shards, args.config, args.charger_config,
+                        args.runner, args.out_dir)
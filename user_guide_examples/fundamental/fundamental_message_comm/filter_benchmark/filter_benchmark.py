@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Benchmark comparing the overhead of the three ways the
+fundamental_message_comm examples apply communication effects to the
+Charger/Controller messages:
+
+    native  - native HELICS delay filter on "Controller/ep"
+              (as in filter_native)
+    clone   - native cloning filter delivering a copy of every controller
+              message to a logger federate (as in filter_clone)
+    federate - reroute filter sending every message through the Python
+              filter federate (filter_federate/Filter.py)
+
+For every combination of mode, EV count and message period the benchmark
+generates the federate configs and a runner file, runs the federation with
+"helics run", and collects the wall-clock time of the whole run, the number
+of time grants each federate needed and the message latency (simulated and
+wall-clock) seen by the controller. The lightweight federates in
+bench_federates.py stand in for the Charger and Controller; the filter
+federate is the real Filter.py from the filter_federate example.
+
+Results are written to "filter_benchmark_results.csv" in the output
+directory.
+
+    python filter_benchmark.py --num_evs 5 50 500 --periods 900 60
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+MODES = ['native', 'clone', 'federate']
+
+script_path = os.path.dirname(os.path.realpath(__file__))
+filter_fed_path = os.path.join(script_path, '..', 'filter_federate')
+
+
+def ev_endpoint_names(num_evs):
+    return [f'Charger/EV{i + 1}.soc' for i in range(num_evs)]
+
+
+def charger_config(num_evs, period):
+    return {
+        'name': 'Charger',
+        'log_level': 'warning',
+        'core_type': 'zmq',
+        'period': period,
+        'uninterruptible': False,
+        'terminate_on_error': True,
+        'endpoints': [{'name': name,
+                       'destination': 'Controller/ep',
+                       'global': True} for name in ev_endpoint_names(num_evs)]
+    }
+
+
+def controller_config(mode, delay):
+    config = {
+        'name': 'Controller',
+        'log_level': 'warning',
+        'core_type': 'zmq',
+        'time_delta': 1,
+        'uninterruptible': False,
+        'terminate_on_error': True,
+        'endpoints': [{'name': 'Controller/ep', 'global': True}]
+    }
+    if mode == 'native':
+        config['filters'] = [{
+            'name': 'ep_filter',
+            'destination_target': 'Controller/ep',
+            'operation': 'delay',
+            'properties': {'name': 'delay', 'value': f'{delay}s'}
+        }]
+    return config
+
+
+def logger_config():
+    return {
+        'name': 'Logger',
+        'log_level': 'warning',
+        'core_type': 'zmq',
+        'time_delta': 1,
+        'uninterruptible': False,
+        'terminate_on_error': True,
+        'endpoints': [{'name': 'Logger/ep', 'global': True}],
+        'filters': [{
+            'name': 'cloning_filter',
+            'destination_target': 'Controller/ep',
+            'delivery': 'Logger/ep',
+            'cloning': True
+        }]
+    }
+
+
+def filter_config(num_evs):
+    return {
+        'name': 'Filter',
+        'log_level': 'warning',
+        'core_type': 'zmq',
+        'uninterruptible': False,
+        'terminate_on_error': False,
+        'event_triggered': True,
+        'endpoints': [{'name': 'filter/main', 'global': True}],
+        'filters': [{
+            'name': 'filterFed',
+            'sourcetargets': ev_endpoint_names(num_evs) + ['Controller/ep'],
+            'operation': 'reroute',
+            'properties': {'name': 'newdestination', 'value': 'filter/main'}
+        }]
+    }
+
+
+def write_json(path, data):
+    with open(path, 'w') as fh:
+        json.dump(data, fh, indent=2)
+
+
+def build_case(case_dir, mode, num_evs, period, duration, delay):
+    '''
+    Writes the federate configs and runner file for a single benchmark
+    case.
+
+    :return: Path to the runner file
+    '''
+    os.makedirs(case_dir, exist_ok=True)
+    bench = os.path.join(script_path, 'bench_federates.py')
+    common = f'-d {duration} -p {period}'
+    write_json(os.path.join(case_dir, 'ChargerConfig.json'),
+               charger_config(num_evs, period))
+    write_json(os.path.join(case_dir, 'ControllerConfig.json'),
+               controller_config(mode, delay))
+    federates = [
+        {'directory': case_dir,
+         'exec': f'python -u {bench} charger -c ChargerConfig.json {common}',
+         'host': 'localhost',
+         'name': 'Charger'},
+        {'directory': case_dir,
+         'exec': f'python -u {bench} controller -c ControllerConfig.json'
+                 f' {common}',
+         'host': 'localhost',
+         'name': 'Controller'}
+    ]
+    if mode == 'clone':
+        write_json(os.path.join(case_dir, 'LoggerConfig.json'),
+                   logger_config())
+        federates.append(
+            {'directory': case_dir,
+             'exec': f'python -u {bench} logger -c LoggerConfig.json'
+                     f' {common}',
+             'host': 'localhost',
+             'name': 'Logger'})
+    elif mode == 'federate':
+        config_path = os.path.join(case_dir, 'FilterConfig.json')
+        metrics_path = os.path.join(case_dir, 'results_filter.json')
+        write_json(config_path, filter_config(num_evs))
+        # No random drops, delays, hacks or interference, so the filter
+        #   federate relays the same traffic the other modes deliver
+        federates.append(
+            {'directory': os.path.realpath(filter_fed_path),
+             'exec': f'python -u Filter.py -c {config_path}'
+                     f' -m {metrics_path} --snapshot_interval 0'
+                     f' -d 0 -t 0 -k 0 -i 0 -l WARNING',
+             'host': 'localhost',
+             'name': 'Filter'})
+
+    runner = {'name': f'filter_benchmark_{mode}_{num_evs}_{period}',
+              'broker': True,
+              'federates': federates}
+    runner_path = os.path.join(case_dir, 'runner.json')
+    write_json(runner_path, runner)
+    return runner_path
+
+
+def read_results(case_dir, role):
+    path = os.path.join(case_dir, f'results_{role}.json')
+    if not os.path.exists(path):
+        logger.warning(f'No results found for {role} in {case_dir}')
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def run_case(case_dir, mode, num_evs, period, duration, delay):
+    '''
+    Runs a single benchmark case and collects the results.
+
+    :return: Dictionary with one row of benchmark results
+    '''
+    runner_path = build_case(case_dir, mode, num_evs, period, duration, delay)
+    logger.info(f'Running {mode} with {num_evs} EVs every {period} s')
+    wall_start = time.perf_counter()
+    status = subprocess.call(f'helics run --path={runner_path}', shell=True)
+    wall_time = time.perf_counter() - wall_start
+
+    charger = read_results(case_dir, 'charger')
+    controller = read_results(case_dir, 'controller')
+    row = {'mode': mode,
+           'num_evs': num_evs,
+           'period': period,
+           'status': status,
+           'wall_time': wall_time,
+           'messages_sent': charger.get('sent'),
+           'messages_received': controller.get('received'),
+           'delivered_share': None,
+           'charger_grants': charger.get('grants'),
+           'controller_grants': controller.get('grants'),
+           'filter_grants': None,
+           'sim_latency_mean': controller.get('sim_latency', {}).get('mean'),
+           'wall_latency_mean': controller.get('wall_latency', {})
+                                          .get('mean'),
+           'wall_latency_p95': controller.get('wall_latency', {}).get('p95')}
+    if row['messages_sent'] and row['messages_received'] is not None:
+        row['delivered_share'] = (row['messages_received']
+                                  / row['messages_sent'])
+    if mode == 'clone':
+        row['filter_grants'] = read_results(case_dir, 'logger').get('grants')
+    elif mode == 'federate':
+        row['filter_grants'] = read_results(case_dir, 'filter').get('grants')
+    return row
+
+
+def main(args):
+    rows = []
+    for num_evs in args.num_evs:
+        for period in args.periods:
+            for mode in args.modes:
+                case_dir = os.path.join(os.path.realpath(args.out_dir),
+                                        f'{mode}_{num_evs}_{period}')
+                rows.append(run_case(case_dir, mode, num_evs, period,
+                                     args.duration, args.delay))
+    df = pd.DataFrame(rows)
+    results_path = os.path.join(args.out_dir, 'filter_benchmark_results.csv')
+    df.to_csv(results_path, index=False)
+    logger.info(f'\n{df.to_string(index=False)}')
+    logger.info(f'Results written to {results_path}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare native, clone and federate filter overhead')
+    parser.add_argument('-n', '--num_evs', nargs='+', type=int,
+                        default=[5, 50, 500])
+    parser.add_argument('-p', '--periods', nargs='+', type=int,
+                        default=[900, 60],
+                        help='Charger SOC message periods in seconds')
+    parser.add_argument('-m', '--modes', nargs='+', choices=MODES,
+                        default=MODES)
+    parser.add_argument('-d', '--duration', type=int, default=86400,
+                        help='Simulated seconds per run')
+    parser.add_argument('--delay', type=int, default=900,
+                        help='Native filter delay in seconds')
+    parser.add_argument('-o', '--out_dir',
+                        default=os.path.join(script_path, 'runs'))
+    args = parser.parse_args()
+    os.makedirs(args.out_dir, exist_ok=True)
+    main(args)
@@ -15,6 +15,7 @@ import numpy as np
 import sys
 import time
 import argparse
+from capture_log import CaptureWriter
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
@@ -50,6 +51,10 @@ if __name__ == "__main__":
                         help="flag to only create a graph of the historic data"
                                 "(no data collection)",
                         action=argparse.BooleanOptionalAction)
+    parser.add_argument('-c', '--capture_file',
+                        help="write every cloned message to this binary"
+                             " capture file (see capture_log.py)",
+                        default='Logger.hcap')
     args = parser.parse_args()
 
 
@@ -67,6 +72,13 @@ if __name__ == "__main__":
     end_name = h.helicsEndpointGetName(endid)
     logger.info("Registered Endpoint ---> {}".format(end_name))
 
+    # Binary capture of every cloned message. Much cheaper to write and
+    #   search than text log lines for long runs.
+    capture = None
+    if args.capture_file:
+        capture = CaptureWriter(args.capture_file)
+        logger.info(f'Capturing cloned messages to {args.capture_file}')
+
     ##############  Entering Execution Mode  ##################################
     h.helicsFederateEnterExecutingMode(fed)
     logger.info('Entered HELICS execution mode')
@@ -116,6 +128,10 @@ if __name__ == "__main__":
             logger.debug(f'\tReceived message from endpoint {source}'
                          f' at time {grantedtime}'
                          f' with SOC {currentsoc}')
+            if capture:
+                capture.write(h.helicsMessageGetTime(msg), source,
+                              h.helicsMessageGetOriginalDestination(msg),
+                              h.helicsMessageGetBytes(msg))
 
 
         # Since we've dealt with all the messages that are queued, there's
@@ -131,6 +147,9 @@ if __name__ == "__main__":
         # logger.info(f'Granted time: {grantedtime}')
 
     # Close out co-simulation execution cleanly now that we're done.
+    if capture:
+        capture.close()
+        logger.info(f'Captured {capture.count} messages')
     destroy_federate(fed)
 
     
\ No newline at end of file
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Append-only binary capture of HELICS messages, intended for the cloning
+filter logger (Logger.py). For long runs, writing every cloned message as a
+text log line is slow and produces files that are painful to search. This
+module writes three files instead:
+
+    <name>.hcap        - the captured messages. After a short file header
+                         ("HCAP" + format version) each message is a fixed
+                         record header followed by the raw payload bytes.
+    <name>.hcap.idx    - time index; one fixed-size entry per message with
+                         the message time, the offset of the message in the
+                         .hcap file and the source/destination IDs.
+    <name>.hcap.names  - endpoint names, one per line; the line number is
+                         the ID used in the record headers and index.
+
+Record header layout (little-endian, struct format "<dIII"):
+
+    time (float64) | source ID (uint32) | destination ID (uint32) |
+    payload length (uint32)
+
+The reader memory-maps the index and the capture so that seeking to a time
+and filtering by endpoint only touches the index entries and the records
+actually requested, never the whole file.
+
+    python capture_log.py Logger.hcap --endpoint Charger/EV1.soc --start 3600
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'HCAP'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sH')
+RECORD_HEADER = struct.Struct('<dIII')
+INDEX_ENTRY = struct.Struct('<dQII')
+INDEX_DTYPE = np.dtype([('time', '<f8'),
+                        ('offset', '<u8'),
+                        ('source', '<u4'),
+                        ('dest', '<u4')])
+
+
+class CaptureWriter:
+    '''
+    Appends messages to a binary capture file and its time index.
+
+    :param path: Path of the capture file; the index and name table are
+        written alongside it.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.names = {}
+        self._data = open(path, 'wb')
+        self._index = open(path + '.idx', 'wb')
+        self._names = open(path + '.names', 'w')
+        self._data.write(FILE_HEADER.pack(MAGIC, VERSION))
+        self._offset = FILE_HEADER.size
+        self.count = 0
+
+    def _name_id(self, name):
+        name_id = self.names.get(name)
+        if name_id is None:
+            name_id = self.names[name] = len(self.names)
+            self._names.write(name + '\n')
+        return name_id
+
+    def write(self, time, source, dest, payload):
+        '''
+        Appends a single message to the capture.
+
+        :param time: Message time
+        :param source: Name of the (original) source endpoint
+        :param dest: Name of the (original) destination endpoint
+        :param payload: Raw message payload (bytes)
+        '''
+        source_id = self._name_id(source)
+        dest_id = self._name_id(dest)
+        self._data.write(RECORD_HEADER.pack(time, source_id, dest_id,
+                                            len(payload)))
+        self._data.write(payload)
+        self._index.write(INDEX_ENTRY.pack(time, self._offset, source_id,
+                                           dest_id))
+        self._offset += RECORD_HEADER.size + len(payload)
+        self.count += 1
+
+    def flush(self):
+        self._names.flush()
+        self._data.flush()
+        self._index.flush()
+
+    def close(self):
+        self._names.close()
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CaptureReader:
+    '''
+    Reads a capture written by CaptureWriter without loading it into
+    memory.
+
+    :param path: Path of the capture file
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        with open(path + '.names') as fh:
+            self.names = fh.read().splitlines()
+        self.name_ids = {name: i for i, name in enumerate(self.names)}
+
+        self._fh = open(path, 'rb')
+        self._data = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = FILE_HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} capture file')
+
+        if os.path.getsize(path + '.idx') > 0:
+            self.index = np.memmap(path + '.idx', dtype=INDEX_DTYPE, mode='r')
+        else:
+            self.index = np.zeros(0, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        return len(self.index)
+
+    def _select(self, start, stop, source, dest, endpoint):
+        # Messages are captured in the order they are received, which is
+        #   time order, so the index times are sorted.
+        lo = 0 if start is None else \
+            int(np.searchsorted(self.index['time'], start, side='left'))
+        hi = len(self.index) if stop is None else \
+            int(np.searchsorted(self.index['time'], stop, side='left'))
+        entries = self.index[lo:hi]
+        mask = np.ones(len(entries), dtype=bool)
+        for name, fields in ((source, ('source',)), (dest, ('dest',)),
+                             (endpoint, ('source', 'dest'))):
+            if name is None:
+                continue
+            name_id = self.name_ids.get(name)
+            if name_id is None:
+                return entries[:0]
+            match = np.zeros(len(entries), dtype=bool)
+            for field in fields:
+                match |= entries[field] == name_id
+            mask &= match
+        return entries[mask]
+
+    def read(self, start=None, stop=None, source=None, dest=None,
+             endpoint=None):
+        '''
+        Iterates over the captured messages in the time window
+        [start, stop), optionally filtered by endpoint.
+
+        :param start: Earliest message time (inclusive)
+        :param stop: Latest message time (exclusive)
+        :param source: Only messages from this endpoint
+        :param dest: Only messages to this endpoint
+        :param endpoint: Only messages from or to this endpoint
+        :return: Generator of (time, source, dest, payload) tuples
+        '''
+        for entry in self._select(start, stop, source, dest, endpoint):
+            offset = int(entry['offset'])
+            time, source_id, dest_id, length = \
+                RECORD_HEADER.unpack_from(self._data, offset)
+            payload_start = offset + RECORD_HEADER.size
+            yield (time, self.names[source_id], self.names[dest_id],
+                   self._data[payload_start:payload_start + length])
+
+    def close(self):
+        if isinstance(self.index, np.memmap):
+            self.index._mmap.close()
+        self._data.close()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Read a message capture')
+    parser.add_argument('path')
+    parser.add_argument('--start', type=float, default=None)
+    parser.add_argument('--stop', type=float, default=None)
+    parser.add_argument('--source', default=None)
+    parser.add_argument('--dest', default=None)
+    parser.add_argument('--endpoint', default=None)
+    args = parser.parse_args()
+
+    with CaptureReader(args.path) as reader:
+        for time, source, dest, payload in reader.read(args.start, args.stop,
+                                                       args.source, args.dest,
+                                                       args.endpoint):
+            print(f'{time}\t{source}\t{dest}\t{payload!r}')
@@ -288,9 +288,12 @@ if __name__ == "__main__":
             if grantedtime % 900 == 0:
                 destination_name = str(
                     h.helicsEndpointGetDefaultDestination(endid[j]))
-                h.helicsEndpointSendMessageRaw(endid[j], "",
-                                               f'{currentsoc[j]:4f}'.encode(
-                                               ))  #
+                # Sending the payload directly to the default destination
+                #   doesn't create a message object at all, so (unlike the
+                #   deprecated helicsEndpointSendMessageRaw) there's nothing
+                #   to allocate or pool per message.
+                h.helicsEndpointSendBytes(endid[j],
+                                          f'{currentsoc[j]:4f}'.encode())
                 logger.debug(f'\tSent message from endpoint {endpoint_name}'
                              f' at time {grantedtime}'
                              f' with payload SOC {currentsoc[j]:4f}')
@@ -30,6 +30,11 @@ import sys
 import helics as h
 import random
 from operator import itemgetter
+from shard_filter_configs import shard_for
+import filter_metrics
+import time_coalescing
+from filter_metrics import FilterMetrics
+from time_coalescing import TimeCoalescer
 
 # Setting up logging
 logger = logging.getLogger(__name__)
@@ -82,8 +87,8 @@ def destroy_federate(fed):
     logger.info('Federate finalized')
 
 
-def configure_federate():
-    fed = h.helicsCreateMessageFederateFromConfig("FilterConfig.json")
+def configure_federate(config_file="FilterConfig.json"):
+    fed = h.helicsCreateMessageFederateFromConfig(config_file)
     federate_name = h.helicsFederateGetName(fed)
     logger.info(f'Created federate {federate_name}')
 
@@ -97,8 +102,8 @@ def configure_federate():
     return fed, endid, end_name
 
 
-def filter_drop_delay(eq, drop_rate, delay_time):
-    if random.random() > 0.1:
+def filter_drop_delay(eq, drop_rate, delay_time, metrics=None):
+    if random.random() >= drop_rate:
         logger.debug(f'\t\t\tMessage not randomly dropped')
         # Pulling incoming message from its parking spot at the end of eq
         msg_dict = eq[-1]
@@ -110,6 +115,8 @@ def filter_drop_delay(eq, drop_rate, delay_time):
         if delay < 0:
             delay = 0
         logger.debug(f'\t\t\tRandom delay time: {delay}')
+        if metrics:
+            metrics.record_delay(msg_dict['source'], msg_dict['dest'], delay)
         transmit_time = msg_dict['time'] + delay
         h.helicsMessageSetTime(msg_dict['msg_obj'], transmit_time)
         msg_dict['time'] = transmit_time
@@ -122,14 +129,18 @@ def filter_drop_delay(eq, drop_rate, delay_time):
         # Because the message is dropped, we remove it from the end of th eq
         del eq[-1]
         logger.debug(f'\t\t\tMessage randomly dropped')
+        if metrics:
+            metrics.count('dropped')
     return eq
     
 
 
 
-def filter_hack(eq, hack_success_rate):
+def filter_hack(eq, hack_success_rate, metrics=None):
     if random.random() < hack_success_rate:
         logger.debug(f'\t\t\tMessage hacked')
+        if metrics:
+            metrics.count('hacked')
         # Pulling incoming message from its parking spot at the end of eq
         msg_dict = eq[-1]
         del eq[-1]
@@ -147,7 +158,7 @@ def filter_hack(eq, hack_success_rate):
     return eq
 
 
-def filter_interfere(eq, interference_threshold_time):
+def filter_interfere(eq, interference_threshold_time, metrics=None):
     threshold = interference_threshold_time
     event_time = eq[0]['time']
     delete_idx = []
@@ -194,6 +205,8 @@ def filter_interfere(eq, interference_threshold_time):
         #   values we care about don't change as the events are removed
         #   from eq
         delete_idx.sort(reverse=True)
+        if metrics:
+            metrics.count('interfered', len(delete_idx))
         for i in delete_idx:
             logger.debug(f'\t\t\tDeleting message from queue:'
                          f'\t\t\t\tsource: {eq[i]["source"]}'
@@ -205,17 +218,19 @@ def filter_interfere(eq, interference_threshold_time):
     return eq
 
 
-def filter_message(eq, cmd, args):
+def filter_message(eq, cmd, args, metrics=None):
     if cmd == 'drop_delay':
         logger.debug(f'\t\tPerforming filter operation drop and delay')
-        eq = filter_drop_delay(eq, args.drop_rate, args.delay_time)
+        eq = filter_drop_delay(eq, args.drop_rate, args.delay_time,
+                               metrics)
     elif cmd == 'hack':
         logger.debug(f'\t\tPerforming filter operation hack')
-        eq = filter_hack(eq, args.hack_success_rate)
+        eq = filter_hack(eq, args.hack_success_rate, metrics)
         pass
     elif cmd == 'interfere':
         logger.debug(f'\t\tPerforming filter operation interfere')
-        eq = filter_interfere(eq, args.interference_threshold_time)
+        eq = filter_interfere(eq, args.interference_threshold_time,
+                              metrics)
         #pass
     else:
         logger.warning(f'Unrecognized command: {cmd}'
@@ -223,7 +238,7 @@ def filter_message(eq, cmd, args):
     return eq
 
 
-def run_cosim(fed, endid, end_name, args):
+def run_cosim(fed, endid, end_name, args, metrics=None):
     # The event queue ("eq") is the master list of events that the filter
     #   federates works on. In this simple filter federate, each event
     #   will be a dictionary with a few parameters:
@@ -239,6 +254,10 @@ def run_cosim(fed, endid, end_name, args):
     #
     eq = []
 
+    # Optionally round time requests up to a multiple of the time
+    #   resolution so that events with nearly the same delivery time are
+    #   dispatched in a single grant.
+    coalescer = TimeCoalescer(args.time_resolution)
 
     logger.info('Attempting to enter execution mode')
     h.helicsFederateEnterExecutingMode(fed)
@@ -269,6 +288,14 @@ def run_cosim(fed, endid, end_name, args):
                          f' to endpoint {dest}'
                          f' for delivery at time {time}'
                          f' with payload \"{msg_str}\"')
+            # When sharded, the reroute filter condition should only ever
+            #   send this shard messages for destinations it owns. Anything
+            #   else indicates the shard configs are out of date.
+            if args.num_shards > 1 and \
+                    shard_for(dest, args.num_shards) != args.shard_index:
+                logger.warning(f'\tShard {args.shard_index} received message'
+                               f' for {dest} owned by shard'
+                               f' {shard_for(dest, args.num_shards)}')
             msg_dict = {'msg_obj':msg,
                         'payload':msg_str,
                         'source':source,
@@ -277,9 +304,11 @@ def run_cosim(fed, endid, end_name, args):
             # Adding messagge to end of eq as a reserved place for all
             # filters to act on.
             eq.append(msg_dict)
-            eq = filter_message(eq, 'drop_delay', args)
+            if metrics:
+                metrics.count('received')
+            eq = filter_message(eq, 'drop_delay', args, metrics)
             if source == 'Controller/ep':
-                eq = filter_message(eq, 'hack', args)
+                eq = filter_message(eq, 'hack', args, metrics)
 
         # Sort event queue to get it back in order
         eq = sorted(eq, key=itemgetter('time'))
@@ -290,10 +319,11 @@ def run_cosim(fed, endid, end_name, args):
         #   after interference runs. eq must be freshly sorted for this
         #   filter to work.
         if len(eq) > 0:
-            eq = filter_message(eq, 'interfere', args)
+            eq = filter_message(eq, 'interfere', args, metrics)
 
             # After filtering, send all messages whose time has come (or past;
             #   in which case something has gone wrong)
+            dispatched_times = []
             while eq and eq[0]['time'] <= grantedtime:
                 # Change destination to original destination before sending
                 #   If you don't do this is sends the message back to the rerouted
@@ -305,13 +335,17 @@ def run_cosim(fed, endid, end_name, args):
                              f' to endpoint {eq[0]["dest"]}'
                              f' at time {grantedtime}'
                              f' with payload \"{eq[0]["payload"]}\"')
+                dispatched_times.append(eq[0]['time'])
                 del eq[0]
+                if metrics:
+                    metrics.count('sent')
+            coalescer.record_dispatch(dispatched_times)
 
             if eq:
                 # Event queue not empty, need to schedule filter federate to
                 #   run again when its time to deliver the next message in the
                 #   queue
-                requested_time = eq[0]['time']
+                requested_time = coalescer.request_time(eq[0]['time'])
             else:  
                 # Reachable if interference has removed all the messages
                 #   from the event queue.
@@ -322,9 +356,12 @@ def run_cosim(fed, endid, end_name, args):
 
         else:
             requested_time = h.HELICS_TIME_MAXTIME
+        if metrics:
+            metrics.record_grant(grantedtime, len(eq))
         logger.debug(f'Requesting time {requested_time}\n')
         grantedtime = h.helicsFederateRequestTime(fed, requested_time)
         logger.debug(f'Granted time {grantedtime}')
+    coalescer.log_report()
 
 
 def _auto_run(args):
@@ -343,11 +380,26 @@ def _auto_run(args):
     Returns:
         (none)
     """
-    random.seed(args.random_seed)
+    for log in (logger, filter_metrics.logger, time_coalescing.logger):
+        log.setLevel(args.log_level)
+    # Each shard gets its own RNG stream so sharded runs are repeatable
+    #   without every shard making identical drop/delay decisions.
+    random.seed(f'{args.random_seed}-{args.shard_index}'
+                if args.num_shards > 1 else args.random_seed)
     logger.debug(f'Intializing RNG with seed {args.random_seed}')
-    fed, endid, end_name = configure_federate()
-    run_cosim(fed, endid, end_name, args)
+    fed, endid, end_name = configure_federate(args.config)
+    metrics = None
+    if args.metrics_file:
+        snapshot_file = None
+        if args.snapshot_interval > 0:
+            snapshot_file = os.path.splitext(args.metrics_file)[0] + \
+                            '_snapshots.jsonl'
+        metrics = FilterMetrics(args.metrics_file, snapshot_file,
+                                args.snapshot_interval)
+    run_cosim(fed, endid, end_name, args, metrics)
     destroy_federate(fed)
+    if metrics:
+        metrics.write()
 
 
 if __name__ == '__main__':
@@ -364,22 +416,65 @@ if __name__ == '__main__':
     parser.add_argument('-r',
                         '--random_seed',
                         nargs='?',
+                        type=int,
                         default=2609)
     parser.add_argument('-d',
                         '--drop_rate',
                         nargs='?',
+                        type=float,
                         default=0.1)
     parser.add_argument('-t',
                         '--delay_time',
                         nargs='?',
+                        type=int,
                         default=1800)
     parser.add_argument('-k',
                         '--hack_success_rate',
                         nargs='?',
+                        type=float,
                         default=0.02)
     parser.add_argument('-i',
                         '--interference_threshold_time',
                         nargs='?',
+                        type=int,
                         default=200)
+    parser.add_argument('-c',
+                        '--config',
+                        nargs='?',
+                        default='FilterConfig.json')
+    parser.add_argument('-n',
+                        '--num_shards',
+                        nargs='?',
+                        type=int,
+                        default=1)
+    parser.add_argument('-s',
+                        '--shard_index',
+                        nargs='?',
+                        type=int,
+                        default=0)
+    parser.add_argument('-m',
+                        '--metrics_file',
+                        nargs='?',
+                        default=None,
+                        help='Write queue depth, delay and drop statistics to'
+                             ' this file (disabled if not given)')
+    parser.add_argument('--snapshot_interval',
+                        nargs='?',
+                        type=int,
+                        default=3600,
+                        help='Simulation seconds between metrics snapshots'
+                             ' (0 disables snapshots)')
+    parser.add_argument('--time_resolution',
+                        nargs='?',
+                        type=float,
+                        default=0,
+                        help='Coalesce message deliveries into time windows'
+                             ' of this many seconds (0 disables coalescing)')
+    parser.add_argument('-l',
+                        '--log_level',
+                        nargs='?',
+                        default='DEBUG',
+                        help='Logging level; per-message debug logging'
+                             ' dominates run time for large federations')
     args = parser.parse_args()
     _auto_run(args)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Low-overhead metrics collection for the filter federate (Filter.py). Rather
+than digging through free-text debug logs to figure out why the filter
+federate is slowing down the co-simulation, the filter federate records:
+
+    - event queue depth at every granted time
+    - histogram of the added delay for each source/destination pair
+    - counts of dropped, hacked and interfered (deleted) messages
+    - counts of messages received and forwarded
+
+Everything is kept as plain counters and lists so the per-message cost is a
+handful of dictionary updates. A compact JSON summary is written at the end
+of the co-simulation and, optionally, periodic snapshots (one JSON object
+per line) are written during it so a long-running or hung federation can be
+inspected while it is still running.
+"""
+
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.DEBUG)
+
+
+class FilterMetrics:
+    '''
+    Accumulates filter federate statistics and writes them to disk.
+
+    :param metrics_file: Path of the end-of-run summary file (JSON)
+    :param snapshot_file: Path of the periodic snapshot file (JSON lines).
+        If None, no snapshots are written.
+    :param snapshot_interval: Simulation time (seconds) between snapshots
+    :param bin_width: Width (seconds) of the added-delay histogram bins
+    '''
+
+    def __init__(self, metrics_file='Filter_metrics.json',
+                 snapshot_file=None, snapshot_interval=3600, bin_width=60):
+        self.metrics_file = metrics_file
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+        self.bin_width = bin_width
+        self.next_snapshot = snapshot_interval
+
+        self.queue_time = []
+        self.queue_depth = []
+        self.max_queue_depth = 0
+        self.delay_hist = {}
+        self.counts = {'received': 0,
+                       'sent': 0,
+                       'dropped': 0,
+                       'hacked': 0,
+                       'interfered': 0}
+        self.grants = 0
+        self.wall_start = time.perf_counter()
+
+        if self.snapshot_file:
+            # Truncating any snapshots left over from a previous run.
+            open(self.snapshot_file, 'w').close()
+
+    def count(self, event, n=1):
+        '''
+        Increments one of the event counters ('received', 'sent',
+        'dropped', 'hacked', 'interfered').
+        '''
+        self.counts[event] += n
+
+    def record_delay(self, source, dest, delay):
+        '''
+        Adds one added-delay observation to the histogram for the
+        source/destination pair.
+        '''
+        pair = f'{source}->{dest}'
+        hist = self.delay_hist.get(pair)
+        if hist is None:
+            hist = self.delay_hist[pair] = {}
+        bin_idx = int(delay // self.bin_width)
+        hist[bin_idx] = hist.get(bin_idx, 0) + 1
+
+    def record_grant(self, grantedtime, eq_depth):
+        '''
+        Records the event queue depth at a granted time and writes a
+        snapshot if the snapshot interval has elapsed.
+        '''
+        self.grants += 1
+        self.queue_time.append(grantedtime)
+        self.queue_depth.append(eq_depth)
+        if eq_depth > self.max_queue_depth:
+            self.max_queue_depth = eq_depth
+        if self.snapshot_file and grantedtime >= self.next_snapshot:
+            self.write_snapshot(grantedtime)
+            while self.next_snapshot <= grantedtime:
+                self.next_snapshot += self.snapshot_interval
+
+    def summary(self):
+        '''
+        :return: Dictionary with the current metrics
+        '''
+        depth_total = sum(self.queue_depth)
+        return {
+            'counts': dict(self.counts),
+            'grants': self.grants,
+            'wall_time': time.perf_counter() - self.wall_start,
+            'max_queue_depth': self.max_queue_depth,
+            'mean_queue_depth': (depth_total / len(self.queue_depth)
+                                 if self.queue_depth else 0),
+            'delay_bin_width': self.bin_width,
+            # JSON keys must be strings; bins are "bin index" * bin_width.
+            'delay_hist': {pair: {str(k): v for k, v in sorted(hist.items())}
+                           for pair, hist in self.delay_hist.items()}
+        }
+
+    def write_snapshot(self, grantedtime):
+        '''
+        Appends the current metrics as a single line to the snapshot file.
+        '''
+        snapshot = self.summary()
+        snapshot['time'] = grantedtime
+        snapshot['queue_depth'] = (self.queue_depth[-1]
+                                   if self.queue_depth else 0)
+        with open(self.snapshot_file, 'a') as fh:
+            fh.write(json.dumps(snapshot, separators=(',', ':')) + '\n')
+
+    def write(self):
+        '''
+        Writes the end-of-run summary including the full queue depth time
+        series.
+        '''
+        results = self.summary()
+        results['queue_depth'] = {'time': self.queue_time,
+                                  'depth': self.queue_depth}
+        with open(self.metrics_file, 'w') as fh:
+            json.dump(results, fh, separators=(',', ':'))
+        logger.info(f'Wrote filter metrics to {self.metrics_file}')
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Launcher/config generator for running the filter federate (Filter.py) as
+several sharded processes rather than one. Each shard owns a subset of the
+endpoints whose messages are being rerouted, chosen by a stable hash of the
+original message destination. All messages headed to a given destination are
+always rerouted to the same shard, so per-destination delivery order is as
+deterministic as it is with a single filter federate while the filtering
+work itself is spread across as many cores as there are shards.
+
+The routing is done by HELICS itself: each shard's reroute filter has the
+same set of source targets as the original FilterConfig.json but adds a
+"condition" property, a regular expression matching only the destinations
+that shard owns. A message whose destination doesn't match is left alone by
+that shard's reroute filter and picked up by the shard that does own it.
+
+Running
+
+    python shard_filter_configs.py -n 3
+
+writes FilterConfig_shard0.json ... FilterConfig_shard2.json and
+fundamental_filter_sharded_runner.json which can be run with
+"helics run --path=fundamental_filter_sharded_runner.json".
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.DEBUG)
+
+
+def shard_for(endpoint_name, num_shards):
+    '''
+    Stable mapping of an endpoint name to a shard index. Python's built-in
+    hash() is salted per-process so BLAKE2 is used instead; the same
+    endpoint name always lands on the same shard in every process and
+    every run. (CRC32 is not used here as endpoint names differing only in
+    their EV number tend to share the low bits of their CRC and pile up on
+    the same shard.)
+
+    :param endpoint_name: Name of the (original) destination endpoint
+    :param num_shards: Total number of filter federate shards
+    :return: Index of the shard owning this endpoint
+    '''
+    digest = hashlib.blake2b(endpoint_name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % num_shards
+
+
+def partition_targets(targets, num_shards):
+    '''
+    Splits the list of endpoints into the subset owned by each shard,
+    preserving the original ordering within each shard.
+
+    :param targets: List of endpoint names
+    :param num_shards: Total number of filter federate shards
+    :return: List (one entry per shard) of lists of endpoint names
+    '''
+    shards = [[] for _ in range(num_shards)]
+    for target in targets:
+        shards[shard_for(target, num_shards)].append(target)
+    return shards
+
+
+def destination_condition(destinations):
+    '''
+    Builds the regular expression used as the reroute filter "condition"
+    property. The expression matches exactly the given destination names.
+
+    :param destinations: List of destination endpoint names
+    :return: Regular expression string
+    '''
+    escaped = [re.escape(dest) for dest in destinations]
+    return f'^({"|".join(escaped)})$'
+
+
+def build_shard_config(base_config, shard_idx, destinations):
+    '''
+    Creates the federate configuration for one shard from the single
+    filter federate configuration.
+
+    :param base_config: Dictionary of the un-sharded filter federate config
+    :param shard_idx: Index of the shard being created
+    :param destinations: Destination endpoints owned by this shard
+    :return: Dictionary with the shard's federate config
+    '''
+    name = base_config['name']
+    shard_ep = f'{base_config["endpoints"][0]["name"].split("/")[0]}/shard{shard_idx}'
+    base_filter = base_config['filters'][0]
+    config = dict(base_config)
+    config['name'] = f'{name}_shard{shard_idx}'
+    config['core_name'] = f'{base_config.get("core_name", name)}_shard{shard_idx}'
+    config['endpoints'] = [{'name': shard_ep, 'global': True}]
+    config['filters'] = [{
+        'name': f'{base_filter["name"]}_shard{shard_idx}',
+        'sourcetargets': base_filter['sourcetargets'],
+        'operation': 'reroute',
+        'properties': [
+            {'name': 'newdestination', 'value': shard_ep},
+            {'name': 'condition',
+             'value': destination_condition(destinations)}
+        ]
+    }]
+    return config
+
+
+def build_runner(base_runner, num_shards, filter_exec='Filter.py'):
+    '''
+    Creates a runner file with the single filter federate replaced by the
+    sharded filter federates.
+
+    :param base_runner: Dictionary of the un-sharded runner file
+    :param num_shards: Total number of filter federate shards
+    :param filter_exec: Name of the filter federate script
+    :return: Dictionary with the sharded runner config
+    '''
+    runner = dict(base_runner)
+    runner['name'] = f'{base_runner["name"]}_sharded'
+    federates = [fed for fed in base_runner['federates']
+                 if filter_exec not in fed['exec']]
+    for shard_idx in range(num_shards):
+        federates.append({
+            'directory': '.',
+            'exec': f'python -u {filter_exec}'
+                    f' -c FilterConfig_shard{shard_idx}.json'
+                    f' -s {shard_idx} -n {num_shards}',
+            'host': 'localhost',
+            'name': f'Filter_shard{shard_idx}'
+        })
+    runner['federates'] = federates
+    return runner
+
+
+def write_shard_configs(num_shards, base_config_path, base_runner_path,
+                        out_dir):
+    '''
+    Reads the un-sharded filter federate config and runner and writes out
+    the sharded versions.
+
+    :param num_shards: Total number of filter federate shards
+    :param base_config_path: Path to un-sharded filter federate config
+    :param base_runner_path: Path to un-sharded runner file
+    :param out_dir: Directory where the sharded files are written
+    :return: Path to the generated runner file
+    '''
+    with open(base_config_path) as fh:
+        base_config = json.load(fh)
+    with open(base_runner_path) as fh:
+        base_runner = json.load(fh)
+
+    # Every rerouted message is headed to one of the endpoints that is also
+    #   a reroute source target (EVs talk to the controller and vice versa).
+    targets = base_config['filters'][0]['sourcetargets']
+    partitions = partition_targets(targets, num_shards)
+    for shard_idx, destinations in enumerate(partitions):
+        if not destinations:
+            logger.warning(f'Shard {shard_idx} owns no destinations; consider'
+                           f' using fewer shards')
+        logger.info(f'Shard {shard_idx} owns {destinations}')
+        config = build_shard_config(base_config, shard_idx, destinations)
+        path = os.path.join(out_dir, f'FilterConfig_shard{shard_idx}.json')
+        with open(path, 'w') as fh:
+            json.dump(config, fh, indent=2)
+
+    runner = build_runner(base_runner, num_shards)
+    runner_path = os.path.join(out_dir,
+                               'fundamental_filter_sharded_runner.json')
+    with open(runner_path, 'w') as fh:
+        json.dump(runner, fh, indent=2)
+    logger.info(f'Wrote runner file {runner_path}')
+    return runner_path
+
+
+if __name__ == '__main__':
+    script_path = os.path.dirname(os.path.realpath(__file__))
+    parser = argparse.ArgumentParser(
+        description='Generate sharded filter federate configs')
+    parser.add_argument('-n',
+                        '--num_shards',
+                        type=int,
+                        default=2)
+    parser.add_argument('-c',
+                        '--config',
+                        default=os.path.join(script_path, 'FilterConfig.json'))
+    parser.add_argument('-r',
+                        '--runner',
+                        default=os.path.join(script_path,
+                                             'fundamental_filter_runner.json'))
+    parser.add_argument('-o',
+                        '--out_dir',
+                        default=script_path)
+    args = parser.parse_args()
+    write_shard_configs(args.num_shards, args.config, args.runner,
+                        args.out_dir)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Time-request coalescing for event-driven relay federates such as the
+filter federate (Filter.py).
+
+A relay federate that requests the exact delivery time of the next event in
+its queue pays for one full time grant per distinct delivery time. When the
+delivery times are jittered (as they are with the random delays added by
+the filter federate), that can easily be more grants than there are
+messages. The TimeCoalescer rounds the requested time up to the next
+multiple of a configurable resolution so that all events falling in the
+same window are dispatched together in a single grant. Events are still
+dispatched in time order; they are just delivered up to one resolution
+window late.
+
+A resolution of 0 disables coalescing and the exact event time is
+requested.
+"""
+
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.DEBUG)
+
+
+class TimeCoalescer:
+    '''
+    Computes coalesced time requests and keeps track of how many time
+    grants were saved by doing so.
+
+    :param resolution: Width of the coalescing window in seconds (0 to
+        disable)
+    '''
+
+    def __init__(self, resolution=0):
+        self.resolution = resolution
+        self.grants = 0
+        self.event_times = 0
+        self.events = 0
+
+    def request_time(self, event_time):
+        '''
+        :param event_time: Delivery time of the earliest queued event
+        :return: Time to request from HELICS
+        '''
+        if self.resolution <= 0:
+            return event_time
+        return math.ceil(event_time / self.resolution) * self.resolution
+
+    def record_dispatch(self, dispatched_times):
+        '''
+        Records the delivery times of the events dispatched in a single
+        grant. Without coalescing each distinct delivery time would have
+        required its own grant.
+
+        :param dispatched_times: List of the delivery times of the events
+            sent during this grant
+        '''
+        if not dispatched_times:
+            return
+        self.grants += 1
+        self.events += len(dispatched_times)
+        self.event_times += len(set(dispatched_times))
+
+    @property
+    def grants_saved(self):
+        return self.event_times - self.grants
+
+    def report(self):
+        '''
+        :return: Dictionary summarizing the coalescing effectiveness
+        '''
+        return {'resolution': self.resolution,
+                'dispatch_grants': self.grants,
+                'distinct_event_times': self.event_times,
+                'events': self.events,
+                'grants_saved': self.grants_saved}
+
+    def log_report(self):
+        logger.info(f'Time coalescing (resolution {self.resolution}):'
+                    f' {self.events} events at {self.event_times} distinct'
+                    f' times dispatched in {self.grants} grants;'
+                    f' {self.grants_saved} grants saved')
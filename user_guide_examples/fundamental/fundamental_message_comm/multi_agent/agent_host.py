@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+In-process host for the multi-agent example. Charger.py and Battery.py run
+one EV charger or battery per federate and per Python process, which is
+fine for five EVs but means a study with hundreds of agents needs hundreds
+of interpreters. This host instead creates N charger and N battery agent
+federates on one shared core in a single process (following the pattern in
+advanced_single_core/battery_charger.py) and steps them all with
+asynchronous time requests so no agent blocks the others while waiting on
+its grant.
+
+The agents register the same interfaces as the per-process versions
+(Charger<i>/soc, Charger<i>/voltage, Battery<i>/current) so they work with
+the unchanged Controller.py:
+
+    helics run --path=multi_agent_host_runner.json
+"""
+
+import argparse
+import matplotlib.pyplot as plt
+import helics as h
+import logging
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.DEBUG)
+
+
+def destroy_federate(fed):
+    '''
+    As part of ending a HELICS co-simulation it is good housekeeping to
+    formally destroy a federate. Doing so informs the rest of the
+    federation that it is no longer a part of the co-simulation and they
+    should proceed without it (if applicable). Generally this is done
+    when the co-simulation is complete and all federates end execution
+    at more or less the same wall-clock time.
+
+    :param fed: Federate to be destroyed
+    :return: (none)
+    '''
+    fed_name = h.helicsFederateGetName(fed)
+    status = h.helicsFederateDisconnect(fed)
+    h.helicsFederateDestroy(fed)
+    logger.debug(f'Federate {fed_name} finalized')
+
+
+def create_fedinfo(core_name, period, wait_for_current_time_update):
+    fedinfo = h.helicsCreateFederateInfo()
+    h.helicsFederateInfoSetCoreName(fedinfo, core_name)
+    h.helicsFederateInfoSetIntegerProperty(fedinfo, h.helics_property_int_log_level, 1)
+    h.helicsFederateInfoSetTimeProperty(fedinfo, h.helics_property_time_period, period)
+    h.helicsFederateInfoSetFlagOption(fedinfo, h.helics_flag_uninterruptible, False)
+    h.helicsFederateInfoSetFlagOption(fedinfo, h.HELICS_FLAG_TERMINATE_ON_ERROR, True)
+    h.helicsFederateInfoSetFlagOption(fedinfo, h.helics_flag_wait_for_current_time_update,
+                                      wait_for_current_time_update)
+    return fedinfo
+
+
+def calc_charging_voltage(EV):
+    """
+    Maps the charging level of an EV to a standard (more or less) charging
+    voltage.
+
+    :param EV: Value of 1, 2, or 3 to indicate charging level
+    :return: charging_voltage: Charging voltage for that level
+    """
+    # Ignoring the difference between AC and DC voltages for this application
+    charge_voltages = {1: 120, 2: 240, 3: 630}
+    return charge_voltages.get(EV, 0)
+
+
+class ChargerAgent:
+    '''
+    Single EV charging terminal; same model as Charger.py.
+
+    :param core_name: Name of the shared core
+    :param idx: Agent number (1-based, matching Charger<idx>Config.json)
+    :param rng: numpy RandomState used by this agent
+    '''
+
+    def __init__(self, core_name, idx, rng, period=60):
+        self.name = f'Charger{idx}'
+        self.rng = rng
+        fedinfo = create_fedinfo(core_name, period, False)
+        self.fed = h.helicsCreateCombinationFederate(self.name, fedinfo)
+        self.endid = h.helicsFederateRegisterGlobalEndpoint(
+            self.fed, f'{self.name}/soc', '')
+        h.helicsEndpointSetDefaultDestination(self.endid, 'Controller/ep')
+        self.pubid = h.helicsFederateRegisterGlobalTypePublication(
+            self.fed, f'{self.name}/voltage', 'double', 'V')
+        self.subid = h.helicsFederateRegisterSubscription(
+            self.fed, f'Battery{idx}/current', 'A')
+        self.charging_voltage = calc_charging_voltage(self.get_new_EV())
+        self.currentsoc = 0
+        self.power = []
+
+    def get_new_EV(self):
+        # Probabilities of a new EV charging at level 1, 2 or 3
+        return self.rng.choice([1, 2, 3], p=[0.05, 0.6, 0.35])
+
+    def estimate_SOC(self, charging_V, charging_A):
+        '''
+        Estimates the SOC from the effective resistance of the battery with
+        a small amount of Gaussian noise on the measured current (see
+        Charger.py).
+        '''
+        socs = np.array([0, 1])
+        effective_R = np.array([8, 150])
+        measured_A = charging_A + self.rng.normal(0, 0.2)
+        measured_R = charging_V / measured_A
+        return np.interp(measured_R, effective_R, socs)
+
+    def initialize(self):
+        # Apply initial charging voltage
+        h.helicsPublicationPublishDouble(self.pubid, self.charging_voltage)
+
+    def step(self, grantedtime):
+        charging_current = h.helicsInputGetDouble(self.subid)
+
+        # New EV is in place after removing charge from old EV,
+        # as indicated by the zero current draw.
+        if charging_current == 0:
+            self.charging_voltage = calc_charging_voltage(self.get_new_EV())
+            self.currentsoc = 0
+        else:
+            self.currentsoc = self.estimate_SOC(self.charging_voltage,
+                                                charging_current)
+
+        # Update charging state based on message from controller
+        #   EV Controller sends "1" - keep charging
+        #   EV Controller sends anything else: stop charging
+        if h.helicsEndpointHasMessage(self.endid):
+            msg = h.helicsEndpointGetMessage(self.endid)
+            if int(h.helicsMessageGetString(msg)) == 0:
+                self.charging_voltage = 0
+                logger.debug(f'\t{self.name}: EV full; removing charging'
+                             f' voltage')
+
+        h.helicsPublicationPublishDouble(self.pubid, self.charging_voltage)
+
+        # Send message to Controller with SOC every 15 minutes
+        if grantedtime % 900 == 0:
+            h.helicsEndpointSendBytes(self.endid,
+                                      f'{self.currentsoc:4f}'.encode())
+
+        self.power.append(self.charging_voltage * charging_current)
+
+
+class BatteryAgent:
+    '''
+    Single EV battery; same model as Battery.py.
+
+    :param core_name: Name of the shared core
+    :param idx: Agent number (1-based, matching Battery<idx>Config.json)
+    :param rng: numpy RandomState used by this agent
+    '''
+
+    def __init__(self, core_name, idx, rng, period=60):
+        self.name = f'Battery{idx}'
+        self.rng = rng
+        self.period = period
+        fedinfo = create_fedinfo(core_name, period, True)
+        self.fed = h.helicsCreateValueFederate(self.name, fedinfo)
+        self.pubid = h.helicsFederateRegisterGlobalTypePublication(
+            self.fed, f'{self.name}/current', 'double', 'A')
+        self.subid = h.helicsFederateRegisterSubscription(
+            self.fed, f'Charger{idx}/voltage', 'V')
+        self.batt_size = self.get_new_battery()
+        self.current_soc = self.rng.randint(0, 60) / 100
+        self.soc = []
+
+    def get_new_battery(self):
+        # Probabilities of a new EV having a 25, 62 or 100 kWh battery
+        return self.rng.choice([25, 62, 100], p=[0.2, 0.2, 0.6])
+
+    def step(self, grantedtime):
+        charging_voltage = h.helicsInputGetDouble(self.subid)
+
+        # New battery is in place when the charger removes the voltage
+        if charging_voltage == 0:
+            self.batt_size = self.get_new_battery()
+            self.current_soc = self.rng.randint(0, 80) / 100
+
+        R = np.interp(self.current_soc, [0, 1], [8, 150])
+        charging_current = charging_voltage / R
+        added_energy = (charging_current * charging_voltage *
+                        self.period / 3600) / 1000
+        self.current_soc = self.current_soc + added_energy / self.batt_size
+
+        h.helicsPublicationPublishDouble(self.pubid, charging_current)
+        self.soc.append(float(self.current_soc))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-agent HELICS host")
+    parser.add_argument("-n", "--num_agents", type=int, default=5)
+    parser.add_argument("-r", "--random_seed", type=int, default=268)
+    parser.add_argument("-d", "--days", type=float, default=1)
+    parser.add_argument("-p", "--show_plots",
+                        action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--core_type", default="zmq")
+    args = parser.parse_args()
+
+    num_agents = args.num_agents
+    core_name = "multi_agent_core"
+    common_core = h.helicsCreateCore(args.core_type, core_name,
+                                     f"--federates={2 * num_agents}")
+
+    ##########  Creating Federates on Common Core with API   ################
+    # Each agent gets its own random number generator so the results don't
+    #   depend on the order the agents are stepped in.
+    chargers = [ChargerAgent(core_name, i + 1,
+                             np.random.RandomState(args.random_seed + i))
+                for i in range(num_agents)]
+    batteries = [BatteryAgent(core_name, i + 1,
+                              np.random.RandomState(args.random_seed + num_agents + i))
+                 for i in range(num_agents)]
+    logger.info(f'Created {num_agents} charger and {num_agents} battery'
+                f' federates on core {core_name}')
+
+    ##############  Entering Execution Mode  ##################################
+    # Same ordering as advanced_single_core/battery_charger.py: the batteries
+    #   use `wait_for_current_time_update` so they are only granted a time
+    #   once the chargers have requested a time beyond it.
+    update_interval = 60
+    for agent in chargers + batteries:
+        h.helicsFederateEnterExecutingModeAsync(agent.fed)
+    for charger in chargers:
+        h.helicsFederateEnterExecutingModeComplete(charger.fed)
+        h.helicsFederateRequestTimeAsync(charger.fed, update_interval)
+    for battery in batteries:
+        h.helicsFederateEnterExecutingModeComplete(battery.fed)
+    logger.info('Entered HELICS execution mode')
+
+    hours = 24 * args.days
+    total_interval = int(60 * 60 * hours)
+    charger_grantedtime = 0
+    battery_grantedtime = 0
+    time_sim = []
+
+    ########## Main co-simulation loop ########################################
+    while charger_grantedtime < total_interval:
+        battery_requested_time = battery_grantedtime + update_interval
+        for battery in batteries:
+            h.helicsFederateRequestTimeAsync(battery.fed, battery_requested_time)
+
+        # All of the chargers have had their time requests in flight since
+        #   the end of the previous step; collect the grants, update each
+        #   charger and immediately put in its next request.
+        for charger in chargers:
+            charger_grantedtime = h.helicsFederateRequestTimeComplete(charger.fed)
+            if charger_grantedtime == update_interval:
+                # Don't look for published currents from the battery on the
+                #   first time grant
+                charger.initialize()
+            else:
+                charger.step(charger_grantedtime)
+            h.helicsFederateRequestTimeAsync(charger.fed,
+                                             charger_grantedtime + update_interval)
+
+        for battery in batteries:
+            battery_grantedtime = h.helicsFederateRequestTimeComplete(battery.fed)
+            battery.step(battery_grantedtime)
+        time_sim.append(battery_grantedtime)
+        logger.debug(f'Granted time {charger_grantedtime}')
+
+    # Cleaning up HELICS stuff once we've finished the co-simulation.
+    logger.info("Destroying federates")
+    for battery in batteries:
+        h.helicsFederateRequestTimeAsync(battery.fed,
+                                         battery_grantedtime + update_interval)
+    for charger in chargers:
+        h.helicsFederateRequestTimeComplete(charger.fed)
+        destroy_federate(charger.fed)
+    for battery in batteries:
+        h.helicsFederateRequestTimeComplete(battery.fed)
+        destroy_federate(battery.fed)
+    logger.info('Federates finalized')
+
+    # Output graph showing the total charging power of all of the agents
+    # The chargers skip recording power on the first time grant
+    xaxis = np.array(time_sim[1:]) / 3600
+    yaxis = np.sum([charger.power for charger in chargers], axis=0)
+    plt.plot(xaxis, yaxis, color="tab:blue", linestyle="-")
+    plt.ylabel("kW")
+    plt.grid(True)
+    plt.xlabel("time (hr)")
+    plt.title(f"Instantaneous Power Draw from {num_agents} EVs")
+    plt.savefig("multi_agent_host_charging_power.png", format="png")
+    if args.show_plots:
+        plt.show()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 10/19/2026
+
+Replay engine for testing the performance of a single federate in
+isolation. Rather than bringing up the whole Battery/Charger/Controller
+federation to profile (for example) Controller.py or Filter.py, this
+stand-in federate reads a capture of the messages and values the federate
+under test received during a full co-simulation and feeds them back to it
+at the recorded simulation times. There are no peer models; the stand-in
+jumps straight from one recorded event time to the next so the federation
+runs as fast as the federate under test allows.
+
+Two capture formats are supported:
+
+    - binary captures written by the cloning filter logger
+      (filter_clone/Logger.py, see filter_clone/capture_log.py)
+    - text captures in the HELICS player/recorder format. Value lines are
+      "<time> <key> [<type>] <value>" and message lines are
+      "m <time> <source> <destination> <payload>". Lines starting with "#"
+      are comments.
+
+The stand-in registers a global endpoint for every captured message source
+and a global publication for every captured value key so, from the point of
+view of the federate under test, messages and values arrive from the same
+names as in the original federation and any replies it sends are delivered
+back to the stand-in (and counted).
+
+    python replay.py ../filter_clone/Logger.hcap --target Controller/ep
+"""
+
+import argparse
+import heapq
+import logging
+import os
+import sys
+import time
+
+import helics as h
+
+script_path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(script_path, '..', 'filter_clone'))
+from capture_log import CaptureReader
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+
+def destroy_federate(fed):
+    '''
+    As part of ending a HELICS co-simulation it is good housekeeping to
+    formally destroy a federate. Doing so informs the rest of the
+    federation that it is no longer a part of the co-simulation and they
+    should proceed without it (if applicable).
+
+    :param fed: Federate to be destroyed
+    :return: (none)
+    '''
+    status = h.helicsFederateDisconnect(fed)
+    h.helicsFederateDestroy(fed)
+    logger.info('Federate finalized')
+
+
+def load_binary_capture(path, targets):
+    '''
+    Reads the messages sent to the target endpoints from a binary capture.
+
+    :param path: Path to the .hcap capture
+    :param targets: Endpoint names of the federate under test; None to
+        replay every captured message
+    :return: List of (time, source, dest, payload) message events
+    '''
+    messages = []
+    with CaptureReader(path) as reader:
+        for time_, source, dest, payload in reader.read():
+            if targets is None or dest in targets:
+                messages.append((time_, source, dest, bytes(payload)))
+    return messages
+
+
+def load_text_capture(path, targets):
+    '''
+    Reads messages and values from a player/recorder style text capture.
+
+    :param path: Path to the text capture
+    :param targets: Endpoint names of the federate under test; None to
+        replay every captured message
+    :return: Tuple of lists of (time, source, dest, payload) message events
+        and (time, key, value) value events
+    '''
+    messages = []
+    values = []
+    with open(path) as fh:
+        for line in fh:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split(None, 4)
+            if fields[0] == 'm':
+                _, time_, source, dest, payload = fields
+                if targets is None or dest in targets:
+                    messages.append((float(time_), source, dest,
+                                     payload.encode()))
+            else:
+                # Optional type column between the key and the value
+                fields = line.split()
+                values.append((float(fields[0]), fields[1], fields[-1]))
+    return messages, values
+
+
+def register_interfaces(fed, messages, values):
+    '''
+    Registers a global endpoint for every message source and a global
+    publication for every value key in the capture.
+
+    :return: Tuple of dictionaries mapping names to endpoints and
+        publications
+    '''
+    endpoints = {}
+    for _, source, _, _ in messages:
+        if source not in endpoints:
+            endpoints[source] = h.helicsFederateRegisterGlobalEndpoint(
+                fed, source, '')
+    pubs = {}
+    for _, key, _ in values:
+        if key not in pubs:
+            pubs[key] = h.helicsFederateRegisterGlobalPublication(
+                fed, key, h.HELICS_DATA_TYPE_STRING, '')
+    return endpoints, pubs
+
+
+def replay(fed, endpoints, pubs, messages, values):
+    '''
+    Sends every captured message and publishes every captured value at its
+    recorded time, jumping directly between event times.
+
+    :return: Dictionary of replay statistics
+    '''
+    # Merge both (time-sorted) event streams into a single stream ordered
+    #   by time only. Events with the same time are ordered by their index
+    #   in their own stream, then messages before values, which need not
+    #   be the order they were captured in; the index also keeps the
+    #   events themselves from being compared.
+    events = list(heapq.merge(
+        ((m[0], i, 'm', m) for i, m in enumerate(messages)),
+        ((v[0], i, 'v', v) for i, v in enumerate(values))))
+
+    h.helicsFederateEnterExecutingMode(fed)
+    wall_start = time.perf_counter()
+    grants = 0
+    replies = 0
+    idx = 0
+    while idx < len(events):
+        event_time = events[idx][0]
+        grantedtime = h.helicsFederateRequestTime(fed, event_time)
+        grants += 1
+        while idx < len(events) and events[idx][0] <= grantedtime:
+            _, _, kind, event = events[idx]
+            if kind == 'm':
+                _, source, dest, payload = event
+                h.helicsEndpointSendBytesTo(endpoints[source], payload, dest)
+            else:
+                _, key, value = event
+                h.helicsPublicationPublishString(pubs[key], value)
+            idx += 1
+        for endid in endpoints.values():
+            while h.helicsEndpointHasMessage(endid):
+                h.helicsEndpointGetMessage(endid)
+                replies += 1
+
+    wall_time = time.perf_counter() - wall_start
+    return {'messages': len(messages),
+            'values': len(values),
+            'grants': grants,
+            'replies': replies,
+            'wall_time': wall_time}
+
+
+def _auto_run(args):
+    targets = set(args.target) if args.target else None
+    if args.capture.endswith('.hcap'):
+        messages = load_binary_capture(args.capture, targets)
+        values = []
+    else:
+        messages, values = load_text_capture(args.capture, targets)
+    logger.info(f'Loaded {len(messages)} messages and {len(values)} values'
+                f' from {args.capture}')
+
+    fedinfo = h.helicsCreateFederateInfo()
+    h.helicsFederateInfoSetCoreTypeFromString(fedinfo, args.core_type)
+    h.helicsFederateInfoSetTimeProperty(fedinfo, h.HELICS_PROPERTY_TIME_DELTA,
+                                        args.time_delta)
+    # Replies from the federate under test are only counted, so there is no
+    #   need to be woken up early when they arrive.
+    h.helicsFederateInfoSetFlagOption(fedinfo, h.HELICS_FLAG_UNINTERRUPTIBLE,
+                                      True)
+    fed = h.helicsCreateCombinationFederate('Replay', fedinfo)
+    endpoints, pubs = register_interfaces(fed, messages, values)
+
+    stats = replay(fed, endpoints, pubs, messages, values)
+    destroy_federate(fed)
+    logger.info(f'Replayed {stats["messages"]} messages and {stats["values"]}'
+                f' values in {stats["grants"]} grants,'
+                f' {stats["wall_time"]:.3f} s wall-clock;'
+                f' received {stats["replies"]} replies')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Replay captured traffic to a single federate')
+    parser.add_argument('capture',
+                        help='.hcap binary capture or player/recorder text'
+                             ' capture')
+    parser.add_argument('-t', '--target', nargs='*', default=None,
+                        help='Endpoints of the federate under test; only'
+                             ' messages sent to them are replayed')
+    parser.add_argument('--core_type', default='zmq')
+    parser.add_argument('--time_delta', type=float, default=1e-9)
+    args = parser.parse_args()
+    _auto_run(args)
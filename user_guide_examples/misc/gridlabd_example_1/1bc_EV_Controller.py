@@ -11,6 +11,7 @@ import logging
 import pandas as pd
 import numpy as np
 import argparse
+from message_pool import MessagePool
 
 
 logger = logging.getLogger(__name__)
@@ -58,6 +59,8 @@ if __name__ == "__main__":
 
     ######################   Entering Execution Mode  ##########################################################
     h.helicsFederateEnterExecutingMode(fed)
+    # Reusing message objects rather than creating one for every command sent
+    msg_pool = MessagePool(fed)
 
     plotting = True ## Adjust this flag to visulaize the control actions aas the simulation progresses
     hours = 24
@@ -126,9 +129,7 @@ if __name__ == "__main__":
                 source_end_name = str(h.helicsEndpointGetName(end))
                 dest_end_name   = str(h.helicsEndpointGetDefaultDestination(end))
                 logger.info("{}: source endpoint {} and destination endpoint {}".format(federate_name, source_end_name, dest_end_name))
-                msg = h.helicsFederateCreateMessage(fed)
-                h.helicsMessageSetString(msg, '0+0j')
-                status = h.helicsEndpointSendMessage(end, msg)
+                msg_pool.send(end, b'0+0j')
                 logger.info("{}: Turning off {}".format(federate_name, source_end_name))
                 k = k + 1
             else: